@@ -8,18 +8,30 @@ Supports multiple ROM sources including Myrient.erista.me
 import os
 import sys
 import json
+import re
+import atexit
+import logging
+import logging.handlers
+import queue
 import requests
 import sqlite3
 from pathlib import Path
 import time
-from datetime import datetime
+from collections import OrderedDict
 import urllib.parse
 import subprocess
 import shutil
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple
 import argparse
 
 
+# Matched against the raw index bytes so the page never has to be decoded whole
+_HREF_RE = re.compile(rb'href="([^"]+)"')
+
+# Color codes are for the terminal only; the log file gets plain text
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+
 class Colors:
     """ANSI color codes for terminal output."""
     RED = '\033[0;31m'
@@ -45,77 +57,84 @@ class ROMBrowser:
         # Current state
         self.current_url = self.base_url_redump
         self.current_dataset = "Redump"
-        self.history = []
+        self.history = OrderedDict()
         self.download_queue = []
+        self._queue_set = set()
         
         # Create directories
         self.temp_dir.mkdir(exist_ok=True)
         self.downloads_dir.mkdir(exist_ok=True)
         
+        # Log file writes happen on a background listener thread
+        self._log_queue = queue.Queue(-1)
+        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('[%(asctime)s] %(message)s', datefmt="%Y-%m-%d %H:%M:%S"))
+        self._log_listener = logging.handlers.QueueListener(self._log_queue, file_handler)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+        
+        self._logger = logging.getLogger('rom_browser')
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.handlers = [logging.handlers.QueueHandler(self._log_queue)]
+        
         # Load state
         self.load_history()
         self.load_download_queue()
         
     def log(self, message: str):
-        """Log message to file and stderr."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        """Log message to file (via the background listener) and stderr."""
+        self._logger.info(_ANSI_RE.sub('', message))
         
         print(message, file=sys.stderr)
     
     def load_history(self):
         """Load browsing history from file."""
-        if self.history_file.exists():
-            try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    self.history = [line.strip() for line in f if line.strip()]
-            except Exception as e:
-                self.log(f"{Colors.YELLOW}Warning: Could not load history: {e}{Colors.NC}")
-                self.history = []
-        else:
-            self.history = []
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                self.history = OrderedDict.fromkeys(line.strip() for line in f if line.strip())
+        except FileNotFoundError:
+            self.history = OrderedDict()
+        except Exception as e:
+            self.log(f"{Colors.YELLOW}Warning: Could not load history: {e}{Colors.NC}")
+            self.history = OrderedDict()
     
     def save_history(self):
         """Save browsing history to file."""
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                for entry in self.history:
-                    f.write(f"{entry}\n")
+            self.history_file.write_text(''.join(f"{entry}\n" for entry in self.history.keys()), encoding='utf-8')
         except Exception as e:
             self.log(f"{Colors.YELLOW}Warning: Could not save history: {e}{Colors.NC}")
     
     def load_download_queue(self):
         """Load download queue from file."""
-        if self.queue_file.exists():
-            try:
-                with open(self.queue_file, 'r', encoding='utf-8') as f:
-                    self.download_queue = [line.strip() for line in f if line.strip()]
-            except Exception as e:
-                self.log(f"{Colors.YELLOW}Warning: Could not load download queue: {e}{Colors.NC}")
-                self.download_queue = []
-        else:
+        try:
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                self.download_queue = list(OrderedDict.fromkeys(line.strip() for line in f if line.strip()))
+        except FileNotFoundError:
+            self.download_queue = []
+        except Exception as e:
+            self.log(f"{Colors.YELLOW}Warning: Could not load download queue: {e}{Colors.NC}")
             self.download_queue = []
+        self._queue_set = set(self.download_queue)
     
     def save_download_queue(self):
         """Save download queue to file."""
         try:
-            with open(self.queue_file, 'w', encoding='utf-8') as f:
-                for item in self.download_queue:
-                    f.write(f"{item}\n")
+            self.queue_file.write_text(''.join(f"{item}\n" for item in self.download_queue), encoding='utf-8')
         except Exception as e:
             self.log(f"{Colors.YELLOW}Warning: Could not save download queue: {e}{Colors.NC}")
     
     def add_to_history(self, url: str):
         """Add URL to browsing history."""
-        if url not in self.history:
-            self.history.append(url)
+        if url in self.history:
+            self.history.move_to_end(url)
+        else:
+            self.history[url] = None
             # Keep only last 100 entries
             if len(self.history) > 100:
-                self.history = self.history[-100:]
-            self.save_history()
+                self.history.popitem(last=False)
+        self.save_history()
     
     def download_index(self, url: str) -> Optional[str]:
         """Download and parse index page."""
@@ -130,8 +149,7 @@ class ROMBrowser:
             response.raise_for_status()
             
             index_file = self.temp_dir / "index.html"
-            with open(index_file, 'w', encoding='utf-8') as f:
-                f.write(response.text)
+            index_file.write_bytes(response.content)
             
             self.log(f"{Colors.GREEN}Index downloaded successfully{Colors.NC}")
             return str(index_file)
@@ -146,17 +164,12 @@ class ROMBrowser:
         files = []
         
         try:
-            with open(index_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = Path(index_file).read_bytes()
             
             # Simple HTML parsing - look for href attributes
-            import re
-            
-            # Find all href attributes
-            href_pattern = r'href="([^"]+)"'
-            hrefs = re.findall(href_pattern, content)
-            
-            for href in hrefs:
+            for raw_href in _HREF_RE.findall(content):
+                href = raw_href.decode('utf-8', errors='replace')
+                
                 # Skip parent directory and absolute URLs
                 if href in ['../', '..'] or href.startswith('http'):
                     continue
@@ -165,8 +178,8 @@ class ROMBrowser:
                 if '?' in href:
                     continue
                 
-                # Decode URL
-                decoded_href = urllib.parse.unquote(href)
+                # Decode URL (most hrefs carry no percent-escapes at all)
+                decoded_href = href if '%' not in href else urllib.parse.unquote(href)
                 
                 if href.endswith('/'):
                     # Directory
@@ -189,9 +202,6 @@ class ROMBrowser:
     
     def apply_filters(self, items: List[str]) -> List[str]:
         """Apply filters to items list."""
-        if not self.filter_file.exists():
-            return items
-        
         try:
             with open(self.filter_file, 'r', encoding='utf-8') as f:
                 filter_lines = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
@@ -203,6 +213,8 @@ class ROMBrowser:
             
             return filtered_items
             
+        except FileNotFoundError:
+            return items
         except Exception as e:
             self.log(f"{Colors.YELLOW}Warning: Could not apply filters: {e}{Colors.NC}")
             return items
@@ -249,6 +261,8 @@ class ROMBrowser:
             elif choice.lower() in ['d', 'download']:
                 self.show_download_queue()
                 return None
+            elif choice.lower() in ['a', 'all']:
+                return -3
             
             # Try to parse as number
             try:
@@ -283,6 +297,7 @@ class ROMBrowser:
   • 'h' or 'help' - Show this help
   • 'f' or 'filter' - Manage filters
   • 'd' or 'download' - Show download queue
+  • 'a' or 'all' - Add every listed file to the download queue
 
 {Colors.GREEN}Filtering:{Colors.NC}
   • Filters are applied automatically
@@ -318,10 +333,6 @@ class ROMBrowser:
     
     def view_filters(self):
         """View current filters."""
-        if not self.filter_file.exists():
-            print(f"{Colors.YELLOW}No filter file found{Colors.NC}")
-            return
-        
         try:
             with open(self.filter_file, 'r', encoding='utf-8') as f:
                 filters = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
@@ -334,6 +345,8 @@ class ROMBrowser:
             for i, filter_line in enumerate(filters, 1):
                 print(f"{i:2d}. {filter_line}")
                 
+        except FileNotFoundError:
+            print(f"{Colors.YELLOW}No filter file found{Colors.NC}")
         except Exception as e:
             print(f"{Colors.RED}Error reading filters: {e}{Colors.NC}")
     
@@ -347,13 +360,15 @@ class ROMBrowser:
         
         try:
             # Check if filter already exists
-            if self.filter_file.exists():
+            try:
                 with open(self.filter_file, 'r', encoding='utf-8') as f:
                     existing_filters = [line.strip() for line in f]
-                
-                if filter_text in existing_filters:
-                    print(f"{Colors.YELLOW}Filter already exists{Colors.NC}")
-                    return
+            except FileNotFoundError:
+                existing_filters = []
+            
+            if filter_text in existing_filters:
+                print(f"{Colors.YELLOW}Filter already exists{Colors.NC}")
+                return
             
             # Add filter
             with open(self.filter_file, 'a', encoding='utf-8') as f:
@@ -403,6 +418,7 @@ class ROMBrowser:
         
         if choice == 'c':
             self.download_queue.clear()
+            self._queue_set.clear()
             self.save_download_queue()
             print(f"{Colors.GREEN}Queue cleared{Colors.NC}")
         elif choice == 's':
@@ -415,13 +431,30 @@ class ROMBrowser:
     
     def add_to_queue(self, item: str):
         """Add item to download queue."""
-        if item not in self.download_queue:
+        if item not in self._queue_set:
             self.download_queue.append(item)
+            self._queue_set.add(item)
             self.save_download_queue()
             print(f"{Colors.GREEN}Added to queue: {item}{Colors.NC}")
         else:
             print(f"{Colors.YELLOW}Item already in queue: {item}{Colors.NC}")
     
+    def add_many_to_queue(self, items: Iterable[str]):
+        """Add several items to the download queue with a single queue file write."""
+        new_items = []
+        for item in items:
+            if item not in self._queue_set:
+                new_items.append(item)
+                self._queue_set.add(item)
+        
+        if not new_items:
+            print(f"{Colors.YELLOW}All items already in queue{Colors.NC}")
+            return
+        
+        self.download_queue.extend(new_items)
+        self.save_download_queue()
+        print(f"{Colors.GREEN}Added {len(new_items)} items to queue{Colors.NC}")
+    
     def browse_directory(self, url: str):
         """Browse a directory interactively."""
         self.add_to_history(url)
@@ -448,6 +481,11 @@ class ROMBrowser:
                 
                 choice = self.get_user_choice(len(directories))
                 
+                # 'all' only applies to file listings; ask again without reloading the index
+                while choice == -3:
+                    print(f"{Colors.YELLOW}No files listed here to add; choose a directory{Colors.NC}")
+                    choice = self.get_user_choice(len(directories))
+                
                 if choice == -1:  # Quit
                     return False
                 elif choice == -2:  # Back
@@ -473,6 +511,9 @@ class ROMBrowser:
                     return False
                 elif choice == -2:  # Back
                     return True
+                elif choice == -3:  # Add all files
+                    self.add_many_to_queue(f"{url}{urllib.parse.quote(file)}" for file in files)
+                    continue
                 elif choice is None:  # Invalid input
                     continue
                 else:
@@ -511,12 +552,17 @@ class ROMBrowser:
     def copy_to_clipboard(self, text: str):
         """Copy text to clipboard."""
         try:
-            if sys.platform == "win32":
-                subprocess.run(['clip'], input=text, text=True, check=True)
-            elif sys.platform == "darwin":
-                subprocess.run(['pbcopy'], input=text, text=True, check=True)
-            else:
-                subprocess.run(['xclip', '-selection', 'clipboard'], input=text, text=True, check=True)
+            try:
+                # pyperclip talks to the OS clipboard API directly, no child process
+                import pyperclip
+                pyperclip.copy(text)
+            except ImportError:
+                if sys.platform == "win32":
+                    subprocess.run(['clip'], input=text, text=True, check=True)
+                elif sys.platform == "darwin":
+                    subprocess.run(['pbcopy'], input=text, text=True, check=True)
+                else:
+                    subprocess.run(['xclip', '-selection', 'clipboard'], input=text, text=True, check=True)
             
             print(f"{Colors.GREEN}URL copied to clipboard{Colors.NC}")
             
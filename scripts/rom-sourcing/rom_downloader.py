@@ -10,6 +10,8 @@ import os
 import sys
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sqlite3
 from pathlib import Path
 import time
@@ -19,8 +21,108 @@ import subprocess
 import shutil
 from typing import List, Dict, Optional, Tuple
 import argparse
+import atexit
+import hashlib
+import logging
+import logging.handlers
+import queue
+import random
+import re
 import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None  # fall back to plain progress lines
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # HEAD probes go through the requests session
+
+
+# ROM file extensions (without the leading dot)
+ROM_EXTENSIONS = frozenset({'zip', '7z', 'rar', 'iso', 'bin', 'cue', 'img', 'mdf', 'mds'})
+
+# Relative links ending in a ROM extension (directories end in '/' and never match)
+_ROM_HREF_RE = re.compile(r'^(?!https?:).*\.(?:%s)$' % '|'.join(sorted(ROM_EXTENSIONS)), re.IGNORECASE | re.DOTALL)
+
+# Human-readable sizes as shown in directory listings ("45M", "1.2 GiB", "4096")
+_SIZE_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def _parse_size(text: str) -> int:
+    """Convert a listing size column to bytes (0 if it isn't a size)."""
+    match = _SIZE_RE.match(text)
+    if not match:
+        return 0
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
+
+
+# Available platforms (archive directory name, abbreviation)
+PLATFORMS: Tuple[Tuple[str, str], ...] = (
+    ("Nintendo - Nintendo Entertainment System", "NES"),
+    ("Nintendo - Super Nintendo Entertainment System", "SNES"),
+    ("Nintendo - Nintendo 64", "N64"),
+    ("Nintendo - Nintendo GameCube", "NGC"),
+    ("Nintendo - Nintendo Wii", "WII"),
+    ("Nintendo - Nintendo Wii U", "WIIU"),
+    ("Nintendo - Nintendo Switch", "NSW"),
+    ("Sony - PlayStation", "PS1"),
+    ("Sony - PlayStation 2", "PS2"),
+    ("Sony - PlayStation 3", "PS3"),
+    ("Sony - PlayStation 4", "PS4"),
+    ("Sony - PlayStation 5", "PS5"),
+    ("Sony - PlayStation Portable", "PSP"),
+    ("Sony - PlayStation Vita", "PSV"),
+    ("Microsoft - Xbox", "XBOX"),
+    ("Microsoft - Xbox 360", "X360"),
+    ("Microsoft - Xbox One", "XONE"),
+    ("Microsoft - Xbox Series X|S", "XSX"),
+    ("Sega - Master System", "SMS"),
+    ("Sega - Mega Drive - Genesis", "MD"),
+    ("Sega - Sega CD", "SCD"),
+    ("Sega - Sega 32X", "32X"),
+    ("Sega - Sega Saturn", "SAT"),
+    ("Sega - Dreamcast", "DC"),
+    ("Atari - 2600", "A2600"),
+    ("Atari - 5200", "A5200"),
+    ("Atari - 7800", "A7800"),
+    ("Atari - Jaguar", "JAG"),
+    ("Atari - Lynx", "LYNX"),
+    ("NEC - PC Engine - TurboGrafx-16", "PCE"),
+    ("NEC - PC Engine CD - TurboGrafx-CD", "PCE-CD"),
+    ("NEC - PC Engine SuperGrafx", "SGX"),
+    ("NEC - PC-FX", "PCFX"),
+    ("SNK - Neo Geo", "NEO"),
+    ("SNK - Neo Geo CD", "NGCD"),
+    ("SNK - Neo Geo Pocket", "NGP"),
+    ("SNK - Neo Geo Pocket Color", "NGPC"),
+    ("Bandai - WonderSwan", "WS"),
+    ("Bandai - WonderSwan Color", "WSC"),
+    ("Commodore - Amiga", "AMIGA"),
+    ("Commodore - Commodore 64", "C64"),
+    ("Commodore - Amiga CD32", "CD32"),
+    ("Apple - Apple II", "APPLE2"),
+    ("Apple - Macintosh", "MAC"),
+    ("IBM - PC", "PC"),
+)
+
+# Download streaming tuning
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+PROGRESS_INTERVAL = 0.5  # seconds between progress updates
+SMALL_FILE_SIZE = 1 << 20  # files below this are fetched in one request without streaming
+
+# Request pacing and retries
+REQUESTS_PER_SECOND = 10.0  # sustained request rate per host
+REQUEST_BURST = 20  # requests allowed back to back before pacing kicks in
+MAX_ATTEMPTS = 5  # tries per file on connection errors, 429 and 503
+
+# Platform indexes younger than this are served from the local cache without a request
+INDEX_CACHE_TTL = 3600  # seconds
 
 
 class Colors:
@@ -34,6 +136,100 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for the given (1-based) attempt."""
+    return min(60, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def _retry_after(response) -> float:
+    """Seconds requested by a Retry-After header (0 if absent or not a number)."""
+    try:
+        return min(60.0, float(response.headers.get('Retry-After', 0)))
+    except ValueError:
+        return 0.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket: allows bursts up to capacity, then rate requests per second."""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available and take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _qs(name: str) -> str:
+    """Percent-encode a single path segment, including any '/' in the name."""
+    return urllib.parse.quote(name, safe='')
+
+
+class PlatformIndexParser(HTMLParser):
+    """Collect ROM file links and their listed sizes from a directory index page in a single pass."""
+    
+    def __init__(self):
+        super().__init__()
+        self.rom_files = []
+        self._pending = None  # ROM link seen in the current table row
+        self._pending_size = 0
+        self._cell_text = None
+        self._link_cell = False
+    
+    def _flush_pending(self):
+        if self._pending is not None:
+            self.rom_files.append((self._pending, self._pending_size))
+        self._pending = None
+        self._pending_size = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self._flush_pending()
+        elif tag == 'td':
+            self._cell_text = []
+            self._link_cell = False
+        elif tag == 'a':
+            self._link_cell = True
+            href = dict(attrs).get('href')
+            
+            # Skip directories, absolute URLs and non-ROM files
+            if href and _ROM_HREF_RE.match(href):
+                self._flush_pending()
+                self._pending = urllib.parse.unquote(href)
+    
+    def handle_data(self, data):
+        if self._cell_text is not None:
+            self._cell_text.append(data)
+    
+    def handle_endtag(self, tag):
+        if tag == 'td':
+            # The first size-like cell after the link cell holds the file size
+            if self._pending is not None and not self._link_cell and not self._pending_size:
+                self._pending_size = _parse_size(''.join(self._cell_text))
+            self._cell_text = None
+        elif tag == 'tr':
+            self._flush_pending()
+    
+    def close(self):
+        super().close()
+        self._flush_pending()
+
+
 class ROMDownloader:
     def __init__(self):
         # Configuration
@@ -43,114 +239,20 @@ class ROMDownloader:
         self.download_dir = Path("./downloads")
         self.queue_file = Path("./download_queue")
         self.log_file = Path("./download_log.txt")
-        self.temp_dir = Path("./temp")
+        self.db_path = Path("./rom_downloader.db")
+        self.max_workers = 8
+        self.force = False  # ignore completed-download records from earlier sessions
+        self.quiet = False  # no per-file progress output
+        self._rate_limits = {}  # host -> TokenBucket
+        self._rate_limits_lock = threading.Lock()
         
         # Available platforms and their subtypes
-        self.platforms = {
-            "Nintendo - Nintendo Entertainment System": "NES",
-            "Nintendo - Super Nintendo Entertainment System": "SNES",
-            "Nintendo - Nintendo 64": "N64",
-            "Nintendo - Nintendo GameCube": "NGC",
-            "Nintendo - Nintendo Wii": "WII",
-            "Nintendo - Nintendo Wii U": "WIIU",
-            "Nintendo - Nintendo Switch": "NSW",
-            "Sony - PlayStation": "PS1",
-            "Sony - PlayStation 2": "PS2",
-            "Sony - PlayStation 3": "PS3",
-            "Sony - PlayStation 4": "PS4",
-            "Sony - PlayStation 5": "PS5",
-            "Sony - PlayStation Portable": "PSP",
-            "Sony - PlayStation Vita": "PSV",
-            "Microsoft - Xbox": "XBOX",
-            "Microsoft - Xbox 360": "X360",
-            "Microsoft - Xbox One": "XONE",
-            "Microsoft - Xbox Series X|S": "XSX",
-            "Sega - Master System": "SMS",
-            "Sega - Mega Drive - Genesis": "MD",
-            "Sega - Sega CD": "SCD",
-            "Sega - Sega 32X": "32X",
-            "Sega - Sega Saturn": "SAT",
-            "Sega - Dreamcast": "DC",
-            "Atari - 2600": "A2600",
-            "Atari - 5200": "A5200",
-            "Atari - 7800": "A7800",
-            "Atari - Jaguar": "JAG",
-            "Atari - Lynx": "LYNX",
-            "NEC - PC Engine - TurboGrafx-16": "PCE",
-            "NEC - PC Engine CD - TurboGrafx-CD": "PCE-CD",
-            "NEC - PC Engine SuperGrafx": "SGX",
-            "NEC - PC-FX": "PCFX",
-            "SNK - Neo Geo": "NEO",
-            "SNK - Neo Geo CD": "NGCD",
-            "SNK - Neo Geo Pocket": "NGP",
-            "SNK - Neo Geo Pocket Color": "NGPC",
-            "Bandai - WonderSwan": "WS",
-            "Bandai - WonderSwan Color": "WSC",
-            "Commodore - Amiga": "AMIGA",
-            "Commodore - Commodore 64": "C64",
-            "Commodore - Amiga CD32": "CD32",
-            "Apple - Apple II": "APPLE2",
-            "Apple - Macintosh": "MAC",
-            "IBM - PC": "PC",
-            "IBM - PC DOS": "DOS",
-            "IBM - PC Windows": "WIN",
-            "IBM - PC Linux": "LINUX",
-            "IBM - PC macOS": "MACOS",
-            "IBM - PC Android": "ANDROID",
-            "IBM - PC iOS": "IOS",
-            "IBM - PC Web": "WEB",
-            "IBM - PC VR": "VR",
-            "IBM - PC AR": "AR",
-            "IBM - PC Cloud": "CLOUD",
-            "IBM - PC Mobile": "MOBILE",
-            "IBM - PC Handheld": "HANDHELD",
-            "IBM - PC Console": "CONSOLE",
-            "IBM - PC Arcade": "ARCADE",
-            "IBM - PC Pinball": "PINBALL",
-            "IBM - PC Casino": "CASINO",
-            "IBM - PC Educational": "EDU",
-            "IBM - PC Sports": "SPORTS",
-            "IBM - PC Racing": "RACING",
-            "IBM - PC Fighting": "FIGHTING",
-            "IBM - PC Shooter": "SHOOTER",
-            "IBM - PC Adventure": "ADV",
-            "IBM - PC RPG": "RPG",
-            "IBM - PC Strategy": "STRAT",
-            "IBM - PC Simulation": "SIM",
-            "IBM - PC Puzzle": "PUZZLE",
-            "IBM - PC Platformer": "PLAT",
-            "IBM - PC Action": "ACTION",
-            "IBM - PC Horror": "HORROR",
-            "IBM - PC Comedy": "COMEDY",
-            "IBM - PC Drama": "DRAMA",
-            "IBM - PC Sci-Fi": "SCIFI",
-            "IBM - PC Fantasy": "FANTASY",
-            "IBM - PC Historical": "HIST",
-            "IBM - PC Military": "MIL",
-            "IBM - PC Western": "WESTERN",
-            "IBM - PC Crime": "CRIME",
-            "IBM - PC Mystery": "MYSTERY",
-            "IBM - PC Thriller": "THRILLER",
-            "IBM - PC Romance": "ROMANCE",
-            "IBM - PC Musical": "MUSICAL",
-            "IBM - PC Documentary": "DOC",
-            "IBM - PC Animation": "ANIM",
-            "IBM - PC Family": "FAMILY",
-            "IBM - PC Children": "CHILDREN",
-            "IBM - PC Teen": "TEEN",
-            "IBM - PC Adult": "ADULT",
-            "IBM - PC Mature": "MATURE",
-            "IBM - PC Everyone": "EVERYONE",
-            "IBM - PC Everyone 10+": "E10+",
-            "IBM - PC Teen 13+": "T13+",
-            "IBM - PC Mature 17+": "M17+",
-            "IBM - PC Adults Only 18+": "AO18+",
-            "IBM - PC Rating Pending": "RP",
-            "IBM - PC Not Rated": "NR",
-            "IBM - PC Unrated": "UR",
-            "IBM - PC Unknown": "UNK",
-            "IBM - PC Other": "OTHER"
-        }
+        self.platforms = dict(PLATFORMS)
+        
+        # Lookup tables for platform selection
+        self._platforms_list = [name for name, _ in PLATFORMS]
+        self._abbrev_to_platform = {abbrev.lower(): name for name, abbrev in PLATFORMS}
+        self._platform_lc = [(name.lower(), name) for name in self._platforms_list]
         
         # Download statistics
         self.download_stats = {
@@ -161,23 +263,147 @@ class ROMDownloader:
             'total_size': 0,
             'downloaded_size': 0
         }
+        self._stats_lock = threading.Lock()
+        
+        # Shared HTTP session: keep-alive connections are reused across files and threads
+        self.session = requests.Session()
+        self.mount_http_adapter()
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        
+        # HTTP/2 client that multiplexes the bursts of HEAD probes over one connection
+        # (needs httpx[http2]; file transfers stay on the requests session)
+        self.h2_client = None
+        if httpx is not None:
+            try:
+                self.h2_client = httpx.Client(
+                    http2=True,
+                    headers={'User-Agent': self.session.headers['User-Agent']},
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+                    timeout=10.0,
+                    follow_redirects=True
+                )
+            except ImportError:
+                pass  # h2 package not installed
         
         # Create directories
         self.download_dir.mkdir(exist_ok=True)
-        self.temp_dir.mkdir(exist_ok=True)
+        
+        # Initialize database
+        self.init_database()
+        
+        # Log file writes happen on a background listener thread
+        self._log_queue = queue.Queue(-1)
+        file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
+        self._log_listener = logging.handlers.QueueListener(self._log_queue, file_handler)
+        self._log_listener.start()
+        atexit.register(self._log_listener.stop)
+        
+        self._logger = logging.getLogger('rom_downloader')
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.handlers = [logging.handlers.QueueHandler(self._log_queue)]
         
         # Initialize log file
         self.log_message(f"ROM Download Session Started: {datetime.now()}")
     
+    def mount_http_adapter(self):
+        """(Re)mount the session's connection pool, sized so every worker keeps its own connection."""
+        pool_size = max(32, self.max_workers)
+        # 429 and 503 are left to download_file's retry loop, which honours Retry-After and resumes
+        # from the .part file. urllib3 would otherwise retry them itself whenever Retry-After is
+        # present, then raise a RetryError that loop never sees.
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 504],
+                              respect_retry_after_header=False)
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+    
+    def set_concurrency(self, workers: int):
+        """Set the number of parallel downloads and grow the connection pool to match."""
+        self.max_workers = max(1, workers)
+        self.mount_http_adapter()
+    
+    def init_database(self):
+        """Open the SQLite database holding the index cache and download state."""
+        self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self._pending_records = []
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS index_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                body BLOB
+            )
+        ''')
+        
+        self.db.execute('''
+            CREATE TABLE IF NOT EXISTS downloads (
+                url TEXT PRIMARY KEY,
+                filename TEXT,
+                size INTEGER,
+                sha256 TEXT,
+                completed_at REAL,
+                status TEXT
+            )
+        ''')
+        
+        self.db.commit()
+    
+    def get_download_status(self, url: str) -> Optional[str]:
+        """Return the recorded status of a download from any earlier session."""
+        with self._db_lock:
+            row = self.db.execute('SELECT status FROM downloads WHERE url = ?', (url,)).fetchone()
+        return row[0] if row else None
+    
+    def record_download(self, url: str, filename: str, size: int, sha256: Optional[str] = None):
+        """Queue a completed download to be written by flush_download_records()."""
+        with self._db_lock:
+            self._pending_records.append((url, filename, size, sha256, time.time(), 'done'))
+    
+    def flush_download_records(self):
+        """Write all queued download records in one transaction."""
+        with self._db_lock:
+            if not self._pending_records:
+                return
+            self.db.executemany(
+                'INSERT OR REPLACE INTO downloads (url, filename, size, sha256, completed_at, status) VALUES (?, ?, ?, ?, ?, ?)',
+                self._pending_records
+            )
+            self.db.commit()
+            self._pending_records.clear()
+    
     def log_message(self, message: str):
-        """Log message to file and stdout."""
+        """Log message to file (via the background listener) and stdout."""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_entry = f"[{timestamp}] {message}"
         
         print(log_entry)
         
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(f"{log_entry}\n")
+        self._logger.info(log_entry)
+    
+    def rate_limit(self, url: str):
+        """Wait for the per-host rate limiter before sending a request to url."""
+        host = urllib.parse.urlsplit(url).netloc
+        with self._rate_limits_lock:
+            bucket = self._rate_limits.get(host)
+            if bucket is None:
+                bucket = self._rate_limits[host] = TokenBucket(REQUESTS_PER_SECOND, REQUEST_BURST)
+        bucket.acquire()
+    
+    def update_stats(self, key: str, amount: int = 1):
+        """Increment a download statistic (safe to call from worker threads)."""
+        with self._stats_lock:
+            self.download_stats[key] += amount
     
     def show_platform_menu(self):
         """Display platform selection menu."""
@@ -185,14 +411,13 @@ class ROMDownloader:
         self.log_message(f"{Colors.YELLOW}Enter platform name or number:{Colors.NC}")
         print()
         
-        platforms_list = list(self.platforms.keys())
-        for i, platform in enumerate(platforms_list, 1):
+        for i, platform in enumerate(self._platforms_list, 1):
             print(f"{Colors.BLUE}{i:2d}.{Colors.NC} {platform}")
         print()
     
     def get_platform_choice(self) -> Optional[str]:
         """Get platform choice from user."""
-        platforms_list = list(self.platforms.keys())
+        platforms_list = self._platforms_list
         
         while True:
             choice = input(f"{Colors.CYAN}Enter platform name or number: {Colors.NC}").strip()
@@ -211,16 +436,16 @@ class ROMDownloader:
             except ValueError:
                 pass
             
-            # Try to find by name (case-insensitive)
+            # Try to find by abbreviation
             choice_lower = choice.lower()
-            for platform in platforms_list:
-                if choice_lower in platform.lower():
-                    return platform
+            platform = self._abbrev_to_platform.get(choice_lower)
+            if platform:
+                return platform
             
-            # Try to find by abbreviation
-            for platform, abbrev in self.platforms.items():
-                if choice_lower == abbrev.lower():
-                    return platform
+            # Try to find by name (case-insensitive)
+            platform = next((name for name_lower, name in self._platform_lc if choice_lower in name_lower), None)
+            if platform:
+                return platform
             
             print(f"{Colors.RED}Platform not found. Please try again.{Colors.NC}")
     
@@ -243,58 +468,60 @@ class ROMDownloader:
                 print(f"{Colors.RED}Invalid choice. Please enter 1 or 2.{Colors.NC}")
     
     def download_index(self, url: str) -> Optional[str]:
-        """Download and save index page."""
+        """Download index page (or reuse the cached copy) and return its HTML."""
         try:
+            cached = self.db.execute(
+                'SELECT etag, last_modified, fetched_at, body FROM index_cache WHERE url = ?', (url,)
+            ).fetchone()
+            
+            if cached and time.time() - cached[2] < INDEX_CACHE_TTL:
+                self.log_message(f"{Colors.GREEN}Using cached index for {url}{Colors.NC}")
+                return cached[3].decode('utf-8')
+            
             self.log_message(f"{Colors.CYAN}Downloading index from {url}...{Colors.NC}")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
+            # Revalidate a stale cache entry instead of refetching it blindly
+            headers = {}
+            if cached and cached[0]:
+                headers['If-None-Match'] = cached[0]
+            if cached and cached[1]:
+                headers['If-Modified-Since'] = cached[1]
+            
+            self.rate_limit(url)
+            response = self.session.get(url, headers=headers, timeout=30)
+            
+            if cached and response.status_code == 304:
+                self.db.execute('UPDATE index_cache SET fetched_at = ? WHERE url = ?', (time.time(), url))
+                self.db.commit()
+                self.log_message(f"{Colors.GREEN}Index not modified, using cached copy{Colors.NC}")
+                return cached[3].decode('utf-8')
             
-            response = requests.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            index_file = self.temp_dir / "platform_index.html"
-            with open(index_file, 'w', encoding='utf-8') as f:
-                f.write(response.text)
+            html = response.text
+            self.db.execute(
+                'INSERT OR REPLACE INTO index_cache (url, etag, last_modified, fetched_at, body) VALUES (?, ?, ?, ?, ?)',
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'), time.time(), html.encode('utf-8'))
+            )
+            self.db.commit()
             
             self.log_message(f"{Colors.GREEN}Index downloaded successfully{Colors.NC}")
-            return str(index_file)
+            return html
             
         except Exception as e:
             self.log_message(f"{Colors.RED}Failed to download index: {e}{Colors.NC}")
             return None
     
-    def parse_platform_index(self, index_file: str) -> List[str]:
-        """Parse platform index and extract ROM files."""
+    def parse_platform_index(self, html: str) -> List[Tuple[str, int]]:
+        """Parse platform index HTML and extract (ROM file, listed size) pairs."""
         rom_files = []
         
         try:
-            with open(index_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Simple HTML parsing - look for href attributes pointing to ROM files
-            import re
-            
-            # Find all href attributes
-            href_pattern = r'href="([^"]+)"'
-            hrefs = re.findall(href_pattern, content)
-            
-            # ROM file extensions
-            rom_extensions = {'.zip', '.7z', '.rar', '.iso', '.bin', '.cue', '.img', '.mdf', '.mds'}
-            
-            for href in hrefs:
-                # Skip directories and non-ROM files
-                if href.endswith('/') or href.startswith('http'):
-                    continue
-                
-                # Check if it's a ROM file
-                file_path = Path(href)
-                if file_path.suffix.lower() in rom_extensions:
-                    decoded_href = urllib.parse.unquote(href)
-                    rom_files.append(decoded_href)
+            parser = PlatformIndexParser()
+            parser.feed(html)
+            parser.close()
             
-            rom_files.sort()
+            rom_files = sorted(parser.rom_files)
             
         except Exception as e:
             self.log_message(f"{Colors.RED}Error parsing index: {e}{Colors.NC}")
@@ -304,7 +531,11 @@ class ROMDownloader:
     def get_file_size(self, url: str) -> int:
         """Get file size from URL."""
         try:
-            response = requests.head(url, timeout=10)
+            self.rate_limit(url)
+            if self.h2_client is not None:
+                response = self.h2_client.head(url)
+            else:
+                response = self.session.head(url, allow_redirects=True, timeout=10)
             content_length = response.headers.get('content-length')
             if content_length:
                 return int(content_length)
@@ -312,68 +543,224 @@ class ROMDownloader:
             pass
         return 0
     
-    def download_file(self, url: str, filename: str) -> bool:
-        """Download a single file."""
+    def probe_sizes(self, urls: List[str]) -> Dict[str, int]:
+        """Get file sizes for many URLs with overlapping HEAD requests."""
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            return dict(zip(urls, executor.map(self.get_file_size, urls)))
+    
+    def skip_reason(self, url: str, filename: str) -> Optional[str]:
+        """Return why a file needs no download, or None if it does."""
+        # Check if file already exists
+        if (self.download_dir / filename).exists():
+            return "Skipping existing file"
+        
+        # Completed in an earlier session (and possibly moved out of the download dir since)
+        if not self.force and self.get_download_status(url) == 'done':
+            return "Skipping previously downloaded file"
+        
+        return None
+    
+    def download_file(self, url: str, filename: str, expected_size: Optional[int] = None) -> bool:
+        """Download a single file; an expected_size of None means it has not been checked or probed yet."""
         try:
             file_path = self.download_dir / filename
             
-            # Check if file already exists
-            if file_path.exists():
-                self.log_message(f"{Colors.YELLOW}Skipping existing file: {filename}{Colors.NC}")
-                self.download_stats['skipped_files'] += 1
-                return True
-            
-            # Get file size for progress tracking
-            file_size = self.get_file_size(url)
-            self.download_stats['total_size'] += file_size
+            # download_files has already settled skips and probed sizes (0 = unknown) for its items
+            file_size = expected_size
+            if file_size is None:
+                reason = self.skip_reason(url, filename)
+                if reason:
+                    self.log_message(f"{Colors.YELLOW}{reason}: {filename}{Colors.NC}")
+                    self.update_stats('skipped_files')
+                    return True
+                file_size = self.get_file_size(url)
+            self.update_stats('total_size', file_size)
             
             self.log_message(f"{Colors.CYAN}Downloading: {filename} ({file_size:,} bytes){Colors.NC}")
             
-            # Download file
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, stream=True, timeout=60)
-            response.raise_for_status()
-            
-            downloaded_size = 0
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-                        
-                        # Show progress for large files
-                        if file_size > 0 and downloaded_size % (1024 * 1024) == 0:  # Every MB
-                            progress = (downloaded_size / file_size) * 100
-                            print(f"\r{Colors.CYAN}Progress: {progress:.1f}% ({downloaded_size:,}/{file_size:,} bytes){Colors.NC}", end='', flush=True)
-            
-            if file_size > 0:
-                print()  # New line after progress
+            # Retry transient failures with backoff; the .part file lets each retry resume
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                try:
+                    if 0 < file_size < SMALL_FILE_SIZE:
+                        downloaded_size = self.fetch_small_file(url, filename, file_path)
+                    else:
+                        downloaded_size = self.fetch_to_file(url, filename, file_path, file_size)
+                    break
+                except requests.HTTPError as e:
+                    status = e.response.status_code if e.response is not None else 0
+                    if status not in (429, 503) or attempt == MAX_ATTEMPTS:
+                        raise
+                    delay = _retry_after(e.response) or _backoff_delay(attempt)
+                    reason = f"HTTP {status}"
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    if attempt == MAX_ATTEMPTS:
+                        raise
+                    delay = _backoff_delay(attempt)
+                    reason = str(e)
+                
+                self.log_message(f"{Colors.YELLOW}Retrying {filename} in {delay:.1f}s ({reason}){Colors.NC}")
+                time.sleep(delay)
             
-            self.download_stats['downloaded_files'] += 1
-            self.download_stats['downloaded_size'] += downloaded_size
+            self.update_stats('downloaded_files')
+            self.update_stats('downloaded_size', downloaded_size)
             
             self.log_message(f"{Colors.GREEN}Downloaded: {filename}{Colors.NC}")
             return True
             
         except Exception as e:
             self.log_message(f"{Colors.RED}Failed to download {filename}: {e}{Colors.NC}")
-            self.download_stats['failed_files'] += 1
+            self.update_stats('failed_files')
             return False
     
+    def fetch_small_file(self, url: str, filename: str, file_path: Path) -> int:
+        """Fetch a small file in one request and write it with a single call; return its size."""
+        self.rate_limit(url)
+        response = self.session.get(url, timeout=60)
+        response.raise_for_status()
+        
+        data = response.content
+        part_path = file_path.with_name(file_path.name + '.part')
+        part_path.write_bytes(data)
+        os.replace(part_path, file_path)
+        self.record_download(url, filename, len(data), hashlib.sha256(data).hexdigest())
+        
+        return len(data)
+    
+    def fetch_to_file(self, url: str, filename: str, file_path: Path, file_size: int) -> int:
+        """Stream one URL to file_path via a resumable .part file; return the bytes transferred."""
+        # Download into a .part file, resuming a previous partial download if there is one
+        part_path = file_path.with_name(file_path.name + '.part')
+        resume_from = part_path.stat().st_size if part_path.exists() else 0
+        
+        headers = {'Range': f'bytes={resume_from}-'} if resume_from else {}
+        self.rate_limit(url)
+        response = self.session.get(url, headers=headers, stream=True, timeout=60)
+        
+        if response.status_code == 416:
+            # Range not satisfiable: the partial file is unusable, start over
+            response.close()
+            part_path.unlink()
+            resume_from = 0
+            self.rate_limit(url)
+            response = self.session.get(url, stream=True, timeout=60)
+        
+        response.raise_for_status()
+        
+        # Exact length from the response beats the (rounded) listing size
+        content_length = int(response.headers.get('content-length') or 0)
+        if response.status_code == 206:
+            mode = 'ab'
+            # "bytes a-b/*" means the server doesn't know the total; derive it from the body length
+            complete_length = response.headers.get('content-range', '').rpartition('/')[2]
+            if complete_length.isdigit():
+                total_size = int(complete_length)
+            else:
+                total_size = resume_from + content_length if content_length else 0
+            self.log_message(f"{Colors.CYAN}Resuming {filename} from {resume_from:,} bytes{Colors.NC}")
+        else:
+            mode = 'wb'
+            resume_from = 0
+            total_size = content_length
+        if total_size:
+            file_size = total_size
+        
+        # tqdm stacks concurrent bars itself; without it, print throttled progress lines
+        bar = None
+        if tqdm is not None:
+            bar = tqdm(total=file_size or None, initial=resume_from, unit='B', unit_scale=True,
+                       desc=filename, leave=False, disable=self.quiet)
+        
+        # Hash while streaming; a resumed file first hashes the bytes already on disk
+        sha256 = hashlib.sha256()
+        if mode == 'ab':
+            with open(part_path, 'rb') as existing:
+                for block in iter(lambda: existing.read(DOWNLOAD_CHUNK_SIZE), b''):
+                    sha256.update(block)
+        
+        downloaded_size = 0
+        last_progress = 0.0
+        try:
+            with open(part_path, mode, buffering=DOWNLOAD_CHUNK_SIZE) as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        sha256.update(chunk)
+                        downloaded_size += len(chunk)
+                        
+                        if bar is not None:
+                            bar.update(len(chunk))
+                            continue
+                        
+                        # Show progress for large files
+                        now = time.monotonic()
+                        if not self.quiet and file_size > 0 and now - last_progress > PROGRESS_INTERVAL:
+                            last_progress = now
+                            done = resume_from + downloaded_size
+                            progress = (done / file_size) * 100
+                            print(f"\r{Colors.CYAN}Progress: {progress:.1f}% ({done:,}/{file_size:,} bytes){Colors.NC}", end='', flush=True)
+        finally:
+            if bar is not None:
+                bar.close()
+        
+        if bar is None and not self.quiet and file_size > 0:
+            print()  # New line after progress
+        
+        # Only a complete file gets its final name
+        if total_size and os.path.getsize(part_path) != total_size:
+            part_path.unlink()
+            raise IOError(f"size mismatch: expected {total_size:,} bytes, got {resume_from + downloaded_size:,}")
+        os.replace(part_path, file_path)
+        self.record_download(url, filename, resume_from + downloaded_size, sha256.hexdigest())
+        
+        return downloaded_size
+    
+    def download_files(self, items: List[Tuple[str, str, int]]):
+        """Download (url, filename, expected size) items concurrently on a thread pool."""
+        # Settle skips first so sizes are only probed for files that will actually be downloaded
+        pending = []
+        for url, filename, size in items:
+            reason = self.skip_reason(url, filename)
+            if reason:
+                self.log_message(f"{Colors.YELLOW}{reason}: {filename}{Colors.NC}")
+                self.update_stats('skipped_files')
+            else:
+                pending.append((url, filename, size))
+        items = pending
+        total = len(items)
+        
+        # Fill in sizes the index listing didn't provide before any download starts
+        unsized = [url for url, _, size in items if not size]
+        if unsized:
+            sizes = self.probe_sizes(unsized)
+            items = [(url, filename, size or sizes[url]) for url, filename, size in items]
+        
+        known_size = sum(size for _, _, size in items)
+        if known_size:
+            self.log_message(f"{Colors.CYAN}Total download size: {known_size:,} bytes ({known_size / (1024*1024*1024):.2f} GB){Colors.NC}")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(self.download_file, url, filename, size): filename
+                    for url, filename, size in items
+                }
+                
+                for completed, future in enumerate(as_completed(futures), 1):
+                    self.log_message(f"{Colors.CYAN}Finished file {completed}/{total}: {futures[future]}{Colors.NC}")
+        finally:
+            self.flush_download_records()
+    
     def download_platform_roms(self, platform: str, max_files: Optional[int] = None):
         """Download all ROMs for a platform."""
         platform_url = f"{self.rom_archive_base_url}{urllib.parse.quote(platform)}/"
         
         # Download platform index
-        index_file = self.download_index(platform_url)
-        if not index_file:
+        index_html = self.download_index(platform_url)
+        if not index_html:
             return
         
         # Parse ROM files
-        rom_files = self.parse_platform_index(index_file)
+        rom_files = self.parse_platform_index(index_html)
         
         if not rom_files:
             self.log_message(f"{Colors.YELLOW}No ROM files found for platform: {platform}{Colors.NC}")
@@ -388,17 +775,7 @@ class ROMDownloader:
         self.log_message(f"{Colors.CYAN}Found {len(rom_files)} ROM files for {platform}{Colors.NC}")
         
         # Download files
-        for i, rom_file in enumerate(rom_files, 1):
-            file_url = f"{platform_url}{urllib.parse.quote(rom_file)}"
-            
-            self.log_message(f"{Colors.CYAN}Downloading file {i}/{len(rom_files)}: {rom_file}{Colors.NC}")
-            
-            if self.download_file(file_url, rom_file):
-                # Small delay to be respectful to the server
-                time.sleep(0.5)
-            else:
-                # Longer delay on failure
-                time.sleep(2)
+        self.download_files([(f"{platform_url}{_qs(rom_file)}", rom_file, size) for rom_file, size in rom_files])
     
     def download_from_queue(self):
         """Download files from the download queue."""
@@ -419,16 +796,7 @@ class ROMDownloader:
             self.log_message(f"{Colors.CYAN}Downloading {len(queue_items)} files from queue{Colors.NC}")
             
             # Download files from queue
-            for i, url in enumerate(queue_items, 1):
-                filename = url.split('/')[-1]
-                decoded_filename = urllib.parse.unquote(filename)
-                
-                self.log_message(f"{Colors.CYAN}Downloading file {i}/{len(queue_items)}: {decoded_filename}{Colors.NC}")
-                
-                if self.download_file(url, decoded_filename):
-                    time.sleep(0.5)
-                else:
-                    time.sleep(2)
+            self.download_files([(url, urllib.parse.unquote(url.split('/')[-1]), 0) for url in queue_items])
             
             # Clear queue after successful download
             self.queue_file.unlink()
@@ -529,6 +897,7 @@ class ROMDownloader:
   • Download ROMs by platform selection
   • Download from download queue
   • Support for Redump and No-Intro datasets
+  • Parallel downloads (--concurrency, default 8)
   • Progress tracking and statistics
   • Automatic retry on failures
 
@@ -550,6 +919,7 @@ class ROMDownloader:
 {Colors.GREEN}File Storage:{Colors.NC}
   • Downloaded files are saved to: {self.download_dir}
   • Existing files are automatically skipped
+  • Completed downloads are remembered in {self.db_path} (use --force to ignore)
   • Download log: {self.log_file}
 """
         print(help_text)
@@ -571,6 +941,13 @@ class ROMDownloader:
         except Exception as e:
             self.log_message(f"{Colors.RED}Fatal error: {e}{Colors.NC}")
             print(f"{Colors.RED}Fatal error: {e}{Colors.NC}")
+    
+    def close(self):
+        """Close the HTTP clients and the download database."""
+        self.session.close()
+        if self.h2_client is not None:
+            self.h2_client.close()
+        self.db.close()
 
 
 def main():
@@ -581,26 +958,35 @@ def main():
                        default='redump', help='Dataset to use')
     parser.add_argument('--max-files', type=int, help='Maximum files to download')
     parser.add_argument('--queue', action='store_true', help='Download from queue only')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of parallel downloads (default: 8)')
+    parser.add_argument('--force', action='store_true', help='Re-download files recorded as completed in earlier sessions')
+    parser.add_argument('--quiet', '-q', action='store_true', help='Hide per-file progress bars')
     
     args = parser.parse_args()
     
     downloader = ROMDownloader()
+    downloader.set_concurrency(args.concurrency)
+    downloader.force = args.force
+    downloader.quiet = args.quiet
     
     # Apply command line arguments
     if args.dataset == 'no-intro':
         downloader.rom_archive_base_url = downloader.base_url_noin
     
-    if args.queue:
-        # Download from queue only
-        downloader.download_from_queue()
-        downloader.show_download_stats()
-    elif args.platform:
-        # Download specific platform
-        downloader.download_platform_roms(args.platform, args.max_files)
-        downloader.show_download_stats()
-    else:
-        # Interactive mode
-        downloader.run()
+    try:
+        if args.queue:
+            # Download from queue only
+            downloader.download_from_queue()
+            downloader.show_download_stats()
+        elif args.platform:
+            # Download specific platform
+            downloader.download_platform_roms(args.platform, args.max_files)
+            downloader.show_download_stats()
+        else:
+            # Interactive mode
+            downloader.run()
+    finally:
+        downloader.close()
 
 
 if __name__ == "__main__":
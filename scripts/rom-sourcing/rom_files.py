@@ -11,16 +11,27 @@ import os
 import sys
 import json
 import requests
-import sqlite3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.util.request import ACCEPT_ENCODING
 from pathlib import Path
-import time
 from datetime import datetime
 import urllib.parse
 import subprocess
 import shutil
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 import argparse
+import atexit
+import threading
 import re
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional native HTML parser for very large index pages
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 
 class Colors:
@@ -32,6 +43,97 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+def _init_colors():
+    """Blank out the color codes when stdout is not a terminal or NO_COLOR is set."""
+    if not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+        Colors.RED = Colors.GREEN = Colors.YELLOW = Colors.CYAN = Colors.NC = ''
+
+
+_init_colors()
+
+
+# Site navigation links that are not part of the listing
+SKIP_RE = re.compile(r'contact|donate|faq|upload|discord|telegram|hshop|home', re.I)
+PARENT_HREFS = frozenset(('../', '..'))
+
+# Commands accepted at listing prompts, mapped to get_user_choice return codes
+COMMANDS = {
+    'q': -1, 'quit': -1, 'exit': -1,
+    'b': -2, 'back': -2,
+    'f': -3, 'filter': -3,
+    'h': -4, 'help': -4
+}
+
+# Simultaneous downloads for batch mode
+MAX_DOWNLOADS = 5
+
+# Bytes copied per read while streaming a download to disk
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# New history entries held in memory before the history file is rewritten
+HISTORY_FLUSH_INTERVAL = 10
+
+# Parsed directory listings kept in the on-disk index cache
+INDEX_CACHE_SIZE = 200
+
+# Child directories whose listings are fetched in the background while a listing is shown
+PREFETCH_DIRS = 4
+
+
+def _sort_ci(items: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Sort (display name, href) pairs case-insensitively by display name."""
+    return sorted(items, key=lambda item: item[0].casefold())
+
+
+def _getch() -> str:
+    """Read a single key press without waiting for Enter."""
+    try:
+        import msvcrt
+        return msvcrt.getwch()
+    except ImportError:
+        import termios
+        import tty
+        
+        fd = sys.stdin.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            return sys.stdin.read(1)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+
+class IndexParser(HTMLParser):
+    """Split the links of a directory index page into directories and files in one pass."""
+    
+    def __init__(self):
+        super().__init__()
+        self.directories = []  # (display name, href)
+        self.files = []  # (display name, href)
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            attrs = dict(attrs)
+            self.add_link(attrs.get('href'), attrs.get('title'))
+    
+    def add_link(self, href: Optional[str], title: Optional[str]):
+        """Classify one link, ignoring navigation and off-site links."""
+        # Skip parent directory, absolute URLs and query links
+        if not href or href in PARENT_HREFS or href.startswith('http') or '?' in href:
+            return
+        
+        # Skip navigation links
+        if SKIP_RE.search(href):
+            return
+        
+        if href.endswith('/'):
+            # Prefer the title attribute for the display name
+            display_name = title or href.rstrip('/')
+            self.directories.append((urllib.parse.unquote(display_name), href))
+        else:
+            self.files.append((urllib.parse.unquote(href), href))
+
+
 class ROMFilesBrowser:
     def __init__(self):
         # Configuration
@@ -39,223 +141,290 @@ class ROMFilesBrowser:
         self.temp_dir = Path("./temp")
         self.download_dir = Path("./downloads")
         self.log_file = Path("./mbrowse_log.txt")
+        self.history_file = Path("./mbrowse_history.txt")
+        
+        # Opened on the first log entry, then kept open for the session
+        self.log_fh = None
+        self.index_cache_file = self.temp_dir / "index_cache.json"
+        self.debug_dump = False  # Also save fetched index pages to temp/index.html
+        self.parser_backend = 'auto'  # 'auto', 'html' (standard library) or 'selectolax'
         
         # Current state
         self.current_url = self.root_url
         self.history = []
+        self.history_set = set()
+        self.unsaved_history = 0
+        
+        # Parsed listings by URL, revalidated with ETag/Last-Modified
+        self.index_cache = {}
+        self.index_cache_dirty = False
+        self.validated_urls = set()
+        self.cache_lock = threading.Lock()
+        
+        # Background listing prefetches by URL
+        self.prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_DIRS)
+        self.prefetches = {}
+        
+        # Casefolded display names of the listing last filtered, as (items, names)
+        self.filter_names = ([], [])
+        
+        # Shared session so index pages and downloads reuse pooled keep-alive connections
+        self.session = requests.Session()
+        # This adapter is the only retry layer: 429/503 honour Retry-After, otherwise back off exponentially
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # ACCEPT_ENCODING adds br whenever brotli/brotlicffi is installed for urllib3 to decode it
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Myrient CLI)',
+            'Accept-Encoding': ACCEPT_ENCODING
+        })
         
         # Create directories
         self.temp_dir.mkdir(exist_ok=True)
         self.download_dir.mkdir(exist_ok=True)
         
-        # Load history
+        # Registered first so it runs last, after the flushes below that may still log
+        atexit.register(self.close_log)
+        
+        # Load history and cached listings
         self.load_history()
+        self.load_index_cache()
+        atexit.register(self.flush_history)
+        atexit.register(self.flush_index_cache)
     
     def log(self, message: str):
         """Log message to file and stderr."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        
         print(message, file=sys.stderr)
         
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(f"{log_entry}\n")
+        # Line buffering flushes each entry
+        if self.log_fh is None:
+            self.log_fh = open(self.log_file, 'a', encoding='utf-8', buffering=1)
+        self.log_fh.write(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}\n")
+    
+    def close_log(self):
+        """Close the log file if it was opened."""
+        if self.log_fh is not None:
+            self.log_fh.close()
     
     def load_history(self):
         """Load browsing history from file."""
-        history_file = Path("./mbrowse_history.txt")
-        if history_file.exists():
+        if self.history_file.exists():
             try:
-                with open(history_file, 'r', encoding='utf-8') as f:
+                with open(self.history_file, 'r', encoding='utf-8') as f:
                     self.history = [line.strip() for line in f if line.strip()]
             except Exception as e:
                 self.log(f"{Colors.YELLOW}Warning: Could not load history: {e}{Colors.NC}")
                 self.history = []
         else:
             self.history = []
+        
+        self.history_set = set(self.history)
     
     def save_history(self):
         """Save browsing history to file."""
-        history_file = Path("./mbrowse_history.txt")
         try:
-            with open(history_file, 'w', encoding='utf-8') as f:
-                for entry in self.history:
-                    f.write(f"{entry}\n")
+            # Write a temporary file and swap it in so a crash never leaves a truncated history
+            tmp_file = self.history_file.with_suffix('.tmp')
+            tmp_file.write_text(''.join(f"{entry}\n" for entry in self.history), encoding='utf-8')
+            os.replace(tmp_file, self.history_file)
+            self.unsaved_history = 0
         except Exception as e:
             self.log(f"{Colors.YELLOW}Warning: Could not save history: {e}{Colors.NC}")
     
+    def flush_history(self):
+        """Save browsing history if it has unsaved entries."""
+        if self.unsaved_history:
+            self.save_history()
+    
     def add_to_history(self, url: str):
         """Add URL to browsing history."""
-        if url not in self.history:
-            self.history.append(url)
-            # Keep only last 50 entries
-            if len(self.history) > 50:
-                self.history = self.history[-50:]
+        if url in self.history_set:
+            return
+        
+        self.history.append(url)
+        self.history_set.add(url)
+        
+        # Keep only last 50 entries
+        if len(self.history) > 50:
+            self.history = self.history[-50:]
+            self.history_set = set(self.history)
+        
+        # Save in batches; anything left over is flushed at exit
+        self.unsaved_history += 1
+        if self.unsaved_history >= HISTORY_FLUSH_INTERVAL:
             self.save_history()
     
-    def urlencode(self, text: str) -> str:
-        """Minimal URL encoding for common characters."""
-        # Replace common characters with URL encoding
-        replacements = {
-            '%': '%25',
-            ' ': '%20',
-            '(': '%28',
-            ')': '%29',
-            '+': '%2B',
-            '&': '%26',
-            "'": '%27',
-            ',': '%2C',
-            '[': '%5B',
-            ']': '%5D'
-        }
-        
-        result = text
-        for char, encoded in replacements.items():
-            result = result.replace(char, encoded)
+    def load_index_cache(self):
+        """Load cached directory listings from file."""
+        try:
+            with open(self.index_cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            
+            for url, entry in entries.items():
+                entry['dirs'] = [tuple(item) for item in entry['dirs']]
+                entry['files'] = [tuple(item) for item in entry['files']]
+            self.index_cache = entries
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log(f"{Colors.YELLOW}Warning: Could not load index cache: {e}{Colors.NC}")
+    
+    def save_index_cache(self):
+        """Save cached directory listings to file."""
+        # Snapshot under the lock, then serialise without holding it
+        with self.cache_lock:
+            entries = dict(self.index_cache)
+            self.index_cache_dirty = False
         
-        return result
+        try:
+            # Write a temporary file and swap it in so an interrupted save never corrupts the cache
+            tmp_file = self.index_cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_file, self.index_cache_file)
+        except Exception as e:
+            self.log(f"{Colors.YELLOW}Warning: Could not save index cache: {e}{Colors.NC}")
+    
+    def flush_index_cache(self):
+        """Save cached directory listings if any changed this session."""
+        if self.index_cache_dirty:
+            self.save_index_cache()
+    
+    def touch_index_cache(self, url: str, entry: dict) -> dict:
+        """Store a listing as the most recently used one; call with cache_lock held."""
+        # Most recently used entries go last; drop the least recently used beyond the cache size
+        self.index_cache.pop(url, None)
+        self.index_cache[url] = entry
+        while len(self.index_cache) > INDEX_CACHE_SIZE:
+            del self.index_cache[next(iter(self.index_cache))]
+        # Saved once at exit rather than after every fetch
+        self.index_cache_dirty = True
+        return entry
+    
+    def urlencode(self, text: str) -> str:
+        """URL-encode a path segment."""
+        # Index hrefs usually arrive percent-encoded already; decode first so they aren't encoded twice
+        return urllib.parse.quote(urllib.parse.unquote(text), safe='/:')
     
     def urldecode_display(self, text: str) -> str:
         """Decode URL-encoded characters for display."""
-        # Replace URL encoding with readable characters
-        replacements = {
-            '%20': ' ',
-            '%28': '(',
-            '%29': ')',
-            '%2B': '+',
-            '%26': '&',
-            '%27': "'",
-            '%2C': ',',
-            '%5B': '[',
-            '%5D': ']',
-            '%5b': '[',
-            '%5d': ']'
-        }
+        return urllib.parse.unquote(text)
+    
+    def get_listing(self, url: str) -> Optional[Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]]:
+        """Get the (directories, files) listing for a URL, revalidating it at most once per session."""
+        # Wait for a prefetch of this URL that is already running rather than requesting it twice
+        future = self.prefetches.pop(url, None)
+        if future is not None and not future.cancel():
+            future.result()
+        
+        with self.cache_lock:
+            if url in self.validated_urls and url in self.index_cache:
+                entry = self.touch_index_cache(url, self.index_cache[url])
+                return entry['dirs'], entry['files']
         
-        result = text
-        for encoded, char in replacements.items():
-            result = result.replace(encoded, char)
+        return self.download_index(url)
+    
+    def prefetch_listings(self, url: str, directories: List[Tuple[str, str]]):
+        """Fetch the first few child listings in the background while the user reads this one."""
+        # Drop prefetches for the previous listing that have not started yet
+        for future in self.prefetches.values():
+            future.cancel()
+        self.prefetches = {}
         
-        return result
+        for _, href in directories[:PREFETCH_DIRS]:
+            child_url = f"{url}{self.urlencode(href)}"
+            if child_url not in self.validated_urls:
+                self.prefetches[child_url] = self.prefetch_executor.submit(self.download_index, child_url, True)
     
-    def download_index(self, url: str) -> Optional[str]:
-        """Download and save index page."""
+    def download_index(self, url: str, quiet: bool = False) -> Optional[Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]]:
+        """Download and parse index page, skipping both when the cached copy is still current."""
         try:
-            self.log(f"{Colors.CYAN}Downloading index from {url}...{Colors.NC}")
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Myrient CLI)',
-                'Accept-Encoding': 'gzip, deflate'
-            }
+            if not quiet:
+                self.log(f"{Colors.CYAN}Downloading index from {url}...{Colors.NC}")
+            
+            # Ask the server to confirm our cached copy instead of resending it
+            cached = self.index_cache.get(url)
+            headers = {'Accept': 'text/html'}
+            if cached:
+                if cached.get('etag'):
+                    headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    headers['If-Modified-Since'] = cached['last_modified']
+            
+            response = self.session.get(url, headers=headers, timeout=30)
+            
+            if cached and response.status_code == 304:
+                with self.cache_lock:
+                    self.touch_index_cache(url, cached)
+                    self.validated_urls.add(url)
+                if not quiet:
+                    self.log(f"{Colors.GREEN}Index unchanged, using cached listing{Colors.NC}")
+                return cached['dirs'], cached['files']
             
-            response = requests.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            index_file = self.temp_dir / "index.html"
-            with open(index_file, 'w', encoding='utf-8') as f:
-                f.write(response.text)
-            
-            self.log(f"{Colors.GREEN}Index downloaded successfully{Colors.NC}")
-            return str(index_file)
-            
-        except Exception as e:
-            self.log(f"{Colors.RED}Failed to download index: {e}{Colors.NC}")
-            return None
-    
-    def list_dirs_links(self, index_file: str) -> List[Tuple[str, str]]:
-        """Extract directories from index file."""
-        directories = []
-        
-        try:
-            with open(index_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = response.text
+            # Background prefetches (quiet) would overwrite the dump of the page being viewed
+            if self.debug_dump and not quiet:
+                with open(self.temp_dir / "index.html", 'w', encoding='utf-8') as f:
+                    f.write(content)
             
-            # Find all href attributes pointing to directories
-            href_pattern = r'href="([^"]+/)"'
-            matches = re.findall(href_pattern, content)
+            directories, files = self.parse_index(content)
             
-            for href in matches:
-                # Skip parent directory and absolute URLs
-                if href in ['../', '..'] or href.startswith('http'):
-                    continue
-                
-                # Skip query parameters
-                if '?' in href:
-                    continue
-                
-                # Skip navigation links
-                skip_patterns = ['contact', 'donate', 'faq', 'upload', 'discord', 'telegram', 'hshop', 'home']
-                if any(pattern in href.lower() for pattern in skip_patterns):
-                    continue
-                
-                # Clean href
-                clean_href = href.rstrip('/')
-                
-                # Try to get title attribute for display name
-                display_name = clean_href
-                
-                # Look for title attribute in the same line
-                title_pattern = rf'href="{re.escape(href)}"[^>]*title="([^"]*)"'
-                title_match = re.search(title_pattern, content)
-                if title_match:
-                    display_name = title_match.group(1)
-                
-                # Decode URL for display
-                display_name = self.urldecode_display(display_name)
-                
-                directories.append((display_name, href))
+            with self.cache_lock:
+                self.touch_index_cache(url, {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'dirs': directories,
+                    'files': files
+                })
+                self.validated_urls.add(url)
             
-            # Sort by display name
-            directories.sort(key=lambda x: x[0].lower())
+            if not quiet:
+                self.log(f"{Colors.GREEN}Index downloaded successfully{Colors.NC}")
+            return directories, files
             
         except Exception as e:
-            self.log(f"{Colors.RED}Error parsing directories: {e}{Colors.NC}")
-        
-        return directories
+            if not quiet:
+                self.log(f"{Colors.RED}Failed to download index: {e}{Colors.NC}")
+            return None
     
-    def list_files_links(self, index_file: str) -> List[Tuple[str, str]]:
-        """Extract files from index file."""
+    def parse_index(self, content: str) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """Extract directories and files from index page content in a single pass."""
+        directories = []
         files = []
         
         try:
-            with open(index_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            parser = IndexParser()
             
-            # Find all href attributes pointing to files (not directories)
-            href_pattern = r'href="([^"]+)"'
-            matches = re.findall(href_pattern, content)
-            
-            for href in matches:
-                # Skip directories and absolute URLs
-                if href.endswith('/') or href.startswith('http'):
-                    continue
-                
-                # Skip query parameters
-                if '?' in href:
-                    continue
-                
-                # Skip navigation links
-                skip_patterns = ['contact', 'donate', 'faq', 'upload', 'discord', 'telegram', 'hshop', 'home', 'Parent directory']
-                if any(pattern in href.lower() for pattern in skip_patterns):
-                    continue
-                
-                # Decode URL for display
-                display_name = self.urldecode_display(href)
-                
-                files.append((display_name, href))
+            if self.parser_backend == 'selectolax' or (self.parser_backend == 'auto' and LexborHTMLParser):
+                for link in LexborHTMLParser(content).css('a[href]'):
+                    parser.add_link(link.attributes.get('href'), link.attributes.get('title'))
+            else:
+                parser.feed(content)
+                parser.close()
             
             # Sort by display name
-            files.sort(key=lambda x: x[0].lower())
+            directories = _sort_ci(parser.directories)
+            files = _sort_ci(parser.files)
             
         except Exception as e:
-            self.log(f"{Colors.RED}Error parsing files: {e}{Colors.NC}")
+            self.log(f"{Colors.RED}Error parsing index: {e}{Colors.NC}")
         
-        return files
+        return directories, files
     
     def print_numbered_data(self, data: List[Tuple[str, str]], limit: int = 500):
         """Print numbered data with limit."""
-        for i, (display_name, href) in enumerate(data[:limit], 1):
-            print(f"{i:2d}. {display_name}")
+        if not data:
+            return
+        
+        # Build the whole block and write it once rather than printing row by row
+        sys.stdout.write("\n".join(f"{i:2d}. {display_name}" for i, (display_name, _) in enumerate(data[:limit], 1)) + "\n")
     
     def copy_to_clipboard(self, text: str) -> bool:
         """Copy text to clipboard."""
@@ -285,17 +454,13 @@ class ROMFilesBrowser:
             
             self.log(f"{Colors.CYAN}Downloading: {filename}{Colors.NC}")
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Myrient CLI)'
-            }
-            
-            response = requests.get(url, headers=headers, stream=True, timeout=60)
-            response.raise_for_status()
-            
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            with self.session.get(url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                
+                # Let urllib3 undo any Content-Encoding so the raw stream can be copied straight to disk
+                response.raw.decode_content = True
+                with open(file_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
             
             self.log(f"{Colors.GREEN}Downloaded: {filename}{Colors.NC}")
             return True
@@ -304,6 +469,20 @@ class ROMFilesBrowser:
             self.log(f"{Colors.RED}Failed to download {filename}: {e}{Colors.NC}")
             return False
     
+    def download_files(self, items: List[Tuple[str, str]]) -> int:
+        """Download several (url, filename) pairs concurrently, returning the number that succeeded."""
+        if not items:
+            return 0
+        
+        self.log(f"{Colors.CYAN}Downloading {len(items)} files ({MAX_DOWNLOADS} at a time){Colors.NC}")
+        
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOADS) as executor:
+            results = list(executor.map(lambda item: self.download_file(*item), items))
+        
+        succeeded = sum(results)
+        self.log(f"{Colors.GREEN}Downloaded {succeeded}/{len(items)} files{Colors.NC}")
+        return succeeded
+    
     def get_user_choice(self, max_choice: int) -> Optional[int]:
         """Get user choice from input."""
         try:
@@ -313,27 +492,23 @@ class ROMFilesBrowser:
                 return None
             
             # Check for commands
-            if choice.lower() in ['q', 'quit', 'exit']:
-                return -1
-            elif choice.lower() in ['h', 'help']:
+            command = COMMANDS.get(choice.lower())
+            if command == -4:
                 self.show_help()
                 return None
-            elif choice.lower() in ['b', 'back']:
-                return -2
-            elif choice.lower() in ['f', 'filter']:
-                return -3
+            elif command is not None:
+                return command
             
-            # Try to parse as number
-            try:
-                num_choice = int(choice)
-                if 1 <= num_choice <= max_choice:
-                    return num_choice
-                else:
-                    print(f"{Colors.RED}Invalid choice. Please enter a number between 1 and {max_choice}{Colors.NC}")
-                    return None
-            except ValueError:
+            if not choice.isdecimal():
                 print(f"{Colors.RED}Invalid input. Please enter a number or command{Colors.NC}")
                 return None
+            
+            num_choice = int(choice)
+            if 1 <= num_choice <= max_choice:
+                return num_choice
+            else:
+                print(f"{Colors.RED}Invalid choice. Please enter a number between 1 and {max_choice}{Colors.NC}")
+                return None
                 
         except KeyboardInterrupt:
             print(f"\n{Colors.YELLOW}Operation cancelled{Colors.NC}")
@@ -354,7 +529,7 @@ class ROMFilesBrowser:
 
 {Colors.GREEN}Commands:{Colors.NC}
   • 'h' or 'help' - Show this help
-  • 'f' or 'filter' - Filter items by typing
+  • 'f' or 'filter' - Filter items by typing (space-separated terms must all match)
 
 {Colors.GREEN}File Operations:{Colors.NC}
   • For files: print URL, copy URL to clipboard, or download
@@ -368,116 +543,96 @@ class ROMFilesBrowser:
         print(help_text)
     
     def filter_items(self, items: List[Tuple[str, str]], filter_text: str) -> List[Tuple[str, str]]:
-        """Filter items by text."""
-        if not filter_text:
+        """Filter items by text; with several space-separated terms, names must contain all of them."""
+        terms = filter_text.casefold().split()
+        if not terms:
             return items
         
-        filter_lower = filter_text.lower()
-        filtered = []
+        # Casefold the names once per listing rather than on every filter
+        if self.filter_names[0] is not items:
+            self.filter_names = (items, [display_name.casefold() for display_name, _ in items])
+        names = self.filter_names[1]
         
-        for display_name, href in items:
-            if filter_lower in display_name.lower():
-                filtered.append((display_name, href))
+        if len(terms) == 1:
+            term = terms[0]
+            return [item for item, name in zip(items, names) if term in name]
         
-        return filtered
+        # One lookahead per term, so a single match from the start checks every term in any order
+        pattern = re.compile(''.join(f'(?=.*{re.escape(term)})' for term in terms), re.S)
+        return [item for item, name in zip(items, names) if pattern.match(name)]
+    
+    def select_from(self, items: List[Tuple[str, str]], label: str, on_select: Callable[[Tuple[str, str]], None]) -> str:
+        """Show items, prompt for a number or filter, and pass the chosen item to on_select.
+        
+        Returns 'quit', 'back' or 'continue'.
+        """
+        print(f"\n{Colors.CYAN}{label} ({len(items)}):{Colors.NC}")
+        print("=" * 50)
+        self.print_numbered_data(items)
+        
+        choice = self.get_user_choice(len(items))
+        
+        if choice == -3:  # Filter
+            filter_text = input(f"{Colors.CYAN}Enter filter text: {Colors.NC}").strip()
+            items = self.filter_items(items, filter_text)
+            if not items:
+                print(f"{Colors.YELLOW}No {label.lower()} match filter{Colors.NC}")
+                return 'continue'
+            
+            print(f"\n{Colors.CYAN}Filtered {label.lower()} ({len(items)}):{Colors.NC}")
+            print("=" * 50)
+            self.print_numbered_data(items)
+            
+            choice = self.get_user_choice(len(items))
+        
+        if choice == -1:  # Quit
+            return 'quit'
+        elif choice == -2:  # Back
+            return 'back'
+        elif choice and choice > 0:
+            on_select(items[choice - 1])
+        
+        return 'continue'
     
     def browse_directory(self, url: str):
-        """Browse a directory interactively."""
+        """Browse a directory interactively, returning False if the user quit."""
+        # Directories entered so far; the last one is being shown
+        stack = [url]
         self.add_to_history(url)
         
-        while True:
-            # Download and parse index
-            index_file = self.download_index(url)
-            if not index_file:
+        def enter_directory(item: Tuple[str, str]):
+            child_url = f"{stack[-1]}{self.urlencode(item[1])}"
+            self.add_to_history(child_url)
+            stack.append(child_url)
+        
+        while stack:
+            url = stack[-1]
+            
+            # Get directory listing (cached when unchanged)
+            listing = self.get_listing(url)
+            if listing is None:
                 return False
             
-            directories = self.list_dirs_links(index_file)
-            files = self.list_files_links(index_file)
+            directories, files = listing
             
             # Display current location
             print(f"\n{Colors.CYAN}Current location: {url}{Colors.NC}")
             
-            # Display directories
             if directories:
-                print(f"\n{Colors.CYAN}Directories ({len(directories)}):{Colors.NC}")
-                print("=" * 50)
-                self.print_numbered_data(directories)
-                
-                choice = self.get_user_choice(len(directories))
-                
-                if choice == -1:  # Quit
-                    return False
-                elif choice == -2:  # Back
-                    return True
-                elif choice == -3:  # Filter
-                    filter_text = input(f"{Colors.CYAN}Enter filter text: {Colors.NC}").strip()
-                    filtered_dirs = self.filter_items(directories, filter_text)
-                    if filtered_dirs:
-                        print(f"\n{Colors.CYAN}Filtered directories ({len(filtered_dirs)}):{Colors.NC}")
-                        print("=" * 50)
-                        self.print_numbered_data(filtered_dirs)
-                        
-                        choice = self.get_user_choice(len(filtered_dirs))
-                        if choice and choice > 0:
-                            selected_dir = filtered_dirs[choice - 1]
-                            new_url = f"{url}{self.urlencode(selected_dir[1])}"
-                            
-                            if not self.browse_directory(new_url):
-                                return False
-                            continue
-                    else:
-                        print(f"{Colors.YELLOW}No directories match filter{Colors.NC}")
-                        continue
-                elif choice is None:  # Invalid input
-                    continue
-                else:
-                    # Navigate to selected directory
-                    selected_dir = directories[choice - 1]
-                    new_url = f"{url}{self.urlencode(selected_dir[1])}"
-                    
-                    if not self.browse_directory(new_url):
-                        return False
-                    continue
-            
-            # Display files
-            if files:
-                print(f"\n{Colors.CYAN}Files ({len(files)}):{Colors.NC}")
-                print("=" * 50)
-                self.print_numbered_data(files)
-                
-                choice = self.get_user_choice(len(files))
-                
-                if choice == -1:  # Quit
-                    return False
-                elif choice == -2:  # Back
-                    return True
-                elif choice == -3:  # Filter
-                    filter_text = input(f"{Colors.CYAN}Enter filter text: {Colors.NC}").strip()
-                    filtered_files = self.filter_items(files, filter_text)
-                    if filtered_files:
-                        print(f"\n{Colors.CYAN}Filtered files ({len(filtered_files)}):{Colors.NC}")
-                        print("=" * 50)
-                        self.print_numbered_data(filtered_files)
-                        
-                        choice = self.get_user_choice(len(filtered_files))
-                        if choice and choice > 0:
-                            selected_file = filtered_files[choice - 1]
-                            self.handle_file_selection(url, selected_file)
-                            continue
-                    else:
-                        print(f"{Colors.YELLOW}No files match filter{Colors.NC}")
-                        continue
-                elif choice is None:  # Invalid input
-                    continue
-                else:
-                    # Handle file selection
-                    selected_file = files[choice - 1]
-                    self.handle_file_selection(url, selected_file)
-                    continue
-            
-            # No items found
-            print(f"{Colors.YELLOW}No items found in this directory{Colors.NC}")
-            return True
+                self.prefetch_listings(url, directories)
+                result = self.select_from(directories, 'Directories', enter_directory)
+            elif files:
+                result = self.select_from(files, 'Files', lambda item: self.handle_file_selection(url, item))
+            else:
+                print(f"{Colors.YELLOW}No items found in this directory{Colors.NC}")
+                result = 'back'
+            
+            if result == 'quit':
+                return False
+            elif result == 'back':
+                stack.pop()
+        
+        return True
     
     def handle_file_selection(self, base_url: str, file_info: Tuple[str, str]):
         """Handle file selection."""
@@ -490,22 +645,35 @@ class ROMFilesBrowser:
         print("3. Download file")
         print("4. Back")
         
-        choice = input(f"{Colors.CYAN}Enter choice: {Colors.NC}").strip()
+        # A single key press is enough when reading from a terminal
+        prompt = f"{Colors.CYAN}Enter choice: {Colors.NC}"
+        if sys.stdin.isatty():
+            print(prompt, end='', flush=True)
+            choice = _getch()
+            print(choice)
+        else:
+            choice = input(prompt).strip()
         
-        if choice == '1':
-            print(f"{Colors.GREEN}URL: {file_url}{Colors.NC}")
-        elif choice == '2':
-            if self.copy_to_clipboard(file_url):
-                print(f"{Colors.GREEN}URL copied to clipboard{Colors.NC}")
-            else:
-                print(f"{Colors.RED}Failed to copy URL{Colors.NC}")
-        elif choice == '3':
-            self.download_file(file_url, display_name)
-        elif choice == '4':
-            return
+        actions = {
+            '1': lambda: print(f"{Colors.GREEN}URL: {file_url}{Colors.NC}"),
+            '2': lambda: self.copy_url(file_url),
+            '3': lambda: self.download_file(file_url, display_name),
+            '4': lambda: None
+        }
+        
+        action = actions.get(choice)
+        if action:
+            action()
         else:
             print(f"{Colors.RED}Invalid choice{Colors.NC}")
     
+    def copy_url(self, url: str):
+        """Copy a URL to the clipboard and report the result."""
+        if self.copy_to_clipboard(url):
+            print(f"{Colors.GREEN}URL copied to clipboard{Colors.NC}")
+        else:
+            print(f"{Colors.RED}Failed to copy URL{Colors.NC}")
+    
     def main_menu(self):
         """Main menu loop."""
         while True:
@@ -587,23 +755,42 @@ class ROMFilesBrowser:
         except Exception as e:
             self.log(f"{Colors.RED}Fatal error: {e}{Colors.NC}")
             print(f"{Colors.RED}Fatal error: {e}{Colors.NC}")
+        finally:
+            self.prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            self.session.close()
 
 
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description='Myrient Files Browser')
     parser.add_argument('--url', help='Start with specific URL')
-    parser.add_argument('--download', help='Download specific file URL')
+    parser.add_argument('--download', nargs='+', metavar='URL',
+                        help='Download specific file URLs (or text files listing one URL per line)')
+    parser.add_argument('--parser', choices=['auto', 'html', 'selectolax'], default='auto',
+                        help='Index page parser (auto uses selectolax when installed)')
+    parser.add_argument('--debug-dump', action='store_true', help='Save each fetched index page to temp/index.html')
     
     args = parser.parse_args()
     
+    if args.parser == 'selectolax' and LexborHTMLParser is None:
+        parser.error("--parser selectolax requires the selectolax package")
+    
     browser = ROMFilesBrowser()
+    browser.debug_dump = args.debug_dump
+    browser.parser_backend = args.parser
     
     # Apply command line arguments
     if args.download:
-        # Download specific file
-        filename = args.download.split('/')[-1]
-        browser.download_file(args.download, filename)
+        # Download specific files, expanding any URL list files
+        urls = []
+        for entry in args.download:
+            if os.path.isfile(entry):
+                with open(entry, 'r', encoding='utf-8') as f:
+                    urls.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+            else:
+                urls.append(entry)
+        
+        browser.download_files([(url, browser.urldecode_display(url.rstrip('/').split('/')[-1])) for url in urls])
         return
     
     if args.url:
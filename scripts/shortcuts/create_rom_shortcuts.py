@@ -7,10 +7,74 @@ Creates shortcuts for ROM files that launch directly through their associated em
 import os
 import sys
 import argparse
+import functools
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import pythoncom
 import win32com.client
 
 
+# Shortcuts created concurrently
+SHORTCUT_WORKERS = 8
+
+# ROM directories scanned concurrently
+SCAN_WORKERS = 4
+
+# ROMs handed from a scanning thread to the main thread at a time, and chunks buffered per directory
+SCAN_CHUNK_SIZE = 256
+SCAN_QUEUE_CHUNKS = 4
+
+# Command line arguments per emulator family, matched in order against the emulator file name
+EMULATOR_ARGS = (
+    ('pcsx2', '--fullscreen --nogui'),
+    ('epsxe', '-nogui -loadbin'),
+    ('project64', ''),
+    ('dolphin', '-e'),
+    ('flycast', ''),
+    ('fusion', ''),
+    ('snes9x', ''),
+    ('nestopia', ''),
+    ('visualboyadvance', ''),
+    ('desmume', ''),
+    ('ppsspp', ''),
+    ('mame', ''),  # Launched with the ROM set name instead of the file path
+    ('x64', ''),  # VICE C64 emulator
+    ('winuae', '-f'),
+    ('stella', ''),
+)
+
+# Configuration lines: a comment, or "key = value" split at the first " = "
+CONFIG_LINE_RE = re.compile(r'#|(.*?) = (.*)')
+
+# ROM file extensions for all supported systems
+ROM_EXTENSIONS = frozenset({
+    '.iso', '.bin', '.cue', '.img', '.mdf', '.mds',  # CD/DVD images
+    '.rom', '.nes', '.smc', '.sfc', '.gb', '.gbc', '.gba',  # Cartridge ROMs
+    '.nds', '.3ds', '.cia', '.cci',  # Nintendo handheld
+    '.psp', '.cso', '.pbp',  # PSP
+    '.v64', '.z64', '.n64',  # N64
+    '.gcm', '.gcz', '.wbfs', '.wad',  # GameCube/Wii
+    '.chd', '.gdi', '.cdi',  # Dreamcast
+    '.smd', '.gen', '.md',  # Genesis
+    '.zip', '.7z', '.rar',  # Compressed ROMs
+    '.d64', '.t64', '.tap',  # Commodore 64
+    '.adf', '.ipf', '.hdf',  # Amiga
+    '.a26',  # Atari 2600 (.bin above)
+})
+
+# Region tags removed from ROM names, e.g. "(USA)" or "[JPN]"
+REGION_TAG_RE = re.compile(r'\((?:USA|EUR|JPN)\)|\[(?:USA|EUR|JPN)\]')
+
+
+@functools.lru_cache(maxsize=256)
+def _exists(path):
+    """os.path.exists, cached for emulators shared by several ROM directories."""
+    return os.path.exists(path)
+
+
 def read_rom_config(config_file):
     """Read ROM directories and emulator mappings from configuration file."""
     rom_mappings = {}
@@ -22,122 +86,177 @@ def read_rom_config(config_file):
     
     with open(config_file, 'r', encoding='utf-8') as f:
         for line_num, line in enumerate(f, 1):
-            line = line.strip()
+            match = CONFIG_LINE_RE.match(line.strip())
             
-            # Skip empty lines and comments
-            if not line or line.startswith('#'):
+            # Skip empty lines, comments and lines without a setting
+            if not match or match.group(1) is None:
                 continue
             
+            key, value = match.groups()
+            
             # Handle output directory setting
-            if line.startswith('OUTPUT_DIR = '):
-                output_dir = line.split('=', 1)[1].strip()
+            if key == 'OUTPUT_DIR':
+                output_dir = value.strip()
                 continue
             
             # Handle ROM directory = emulator mapping
-            if ' = ' in line:
-                rom_dir, emulator_path = line.split(' = ', 1)
-                rom_dir = rom_dir.strip()
-                emulator_path = emulator_path.strip()
-                
-                if os.path.exists(rom_dir) and os.path.exists(emulator_path):
-                    rom_mappings[rom_dir] = emulator_path
-                else:
-                    if not os.path.exists(rom_dir):
-                        print(f"Warning: ROM directory '{rom_dir}' (line {line_num}) does not exist. Skipping.")
-                    if not os.path.exists(emulator_path):
-                        print(f"Warning: Emulator path '{emulator_path}' (line {line_num}) does not exist. Skipping.")
+            rom_dir = key.strip()
+            emulator_path = value.strip()
+            
+            if _exists(rom_dir) and _exists(emulator_path):
+                rom_mappings[rom_dir] = emulator_path
+            else:
+                if not _exists(rom_dir):
+                    print(f"Warning: ROM directory '{rom_dir}' (line {line_num}) does not exist. Skipping.")
+                if not _exists(emulator_path):
+                    print(f"Warning: Emulator path '{emulator_path}' (line {line_num}) does not exist. Skipping.")
     
     return rom_mappings, output_dir
 
 
+def iter_files(top):
+    """Yield a DirEntry for every file under top, walking directories in os.walk order."""
+    stack = [top]
+    
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    # DirEntry caches the file type from the directory listing, so no extra stat here
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if not is_dir:
+                        yield entry
+                    elif not entry.is_symlink():
+                        subdirs.append(entry.path)
+        except OSError:
+            # Unreadable directory, skipped like os.walk does
+            pass
+        
+        stack.extend(reversed(subdirs))
+
+
 def find_rom_files(rom_dir):
-    """Find all ROM files in the specified directory."""
-    rom_extensions = {
-        '.iso', '.bin', '.cue', '.img', '.mdf', '.mds',  # CD/DVD images
-        '.rom', '.nes', '.smc', '.sfc', '.gb', '.gbc', '.gba',  # Cartridge ROMs
-        '.nds', '.3ds', '.cia', '.cci',  # Nintendo handheld
-        '.psp', '.cso', '.pbp',  # PSP
-        '.v64', '.z64', '.n64',  # N64
-        '.gcm', '.gcz', '.wbfs', '.wad',  # GameCube/Wii
-        '.chd', '.gdi', '.cdi',  # Dreamcast
-        '.smd', '.gen', '.md',  # Genesis
-        '.zip', '.7z', '.rar',  # Compressed ROMs
-        '.d64', '.t64', '.tap',  # Commodore 64
-        '.adf', '.ipf', '.hdf',  # Amiga
-        '.a26', '.bin',  # Atari 2600
-    }
-    
-    rom_files = []
+    """Yield all ROM files in the specified directory."""
     rom_path = Path(rom_dir)
     
     if not rom_path.exists():
-        return rom_files
+        return
+    
+    for entry in iter_files(rom_path):
+        # Check the extension on the plain name; only matches become Path objects
+        dot = entry.name.rfind('.')
+        if dot > 0 and entry.name[dot:].lower() in ROM_EXTENSIONS:
+            yield Path(entry.path)
+
+
+def scan_rom_directories(rom_dirs):
+    """Yield (rom_dir, rom_files) in the given order, scanning several directories concurrently.
     
-    for root, dirs, files in os.walk(rom_path):
-        for file in files:
-            file_path = Path(root) / file
-            if file_path.suffix.lower() in rom_extensions:
-                rom_files.append(file_path)
+    rom_files is an iterator fed in chunks through a bounded queue, so only a few chunks per
+    directory are held in memory rather than every directory's full ROM list.
+    """
+    rom_dirs = list(rom_dirs)
+    channels = [queue.Queue(maxsize=SCAN_QUEUE_CHUNKS) for _ in rom_dirs]
+    cancelled = threading.Event()
+    
+    def put(channel, item):
+        # Give up once the consumer has stopped reading instead of blocking forever
+        while not cancelled.is_set():
+            try:
+                channel.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def scan(rom_dir, channel):
+        chunk = []
+        try:
+            for rom_file in find_rom_files(rom_dir):
+                chunk.append(rom_file)
+                if len(chunk) == SCAN_CHUNK_SIZE:
+                    if not put(channel, chunk):
+                        return
+                    chunk = []
+        except Exception as e:
+            # Re-raised in the main thread when this directory is read
+            put(channel, e)
+            return
+        
+        if put(channel, chunk):
+            put(channel, None)  # End of this directory
     
-    return rom_files
+    def read(channel):
+        while True:
+            chunk = channel.get()
+            if chunk is None:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield from chunk
+    
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        try:
+            # Directories are picked up in order, so the one being read is always being scanned
+            for rom_dir, channel in zip(rom_dirs, channels):
+                executor.submit(scan, rom_dir, channel)
+            
+            for rom_dir, channel in zip(rom_dirs, channels):
+                yield rom_dir, read(channel)
+        finally:
+            cancelled.set()
 
 
-def get_emulator_args(emulator_path, rom_file):
-    """Get command line arguments for different emulators."""
+def file_key(path):
+    """Return (device, inode) for path so links to the same file compare equal; falls back to the path."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path
+    return stat.st_dev, stat.st_ino
+
+
+def build_args_template(emulator_path):
+    """Return a function that builds the emulator arguments for a ROM, resolving the emulator only once."""
     emulator_name = Path(emulator_path).name.lower()
     
-    if 'pcsx2' in emulator_name:
-        return f'"{emulator_path}" --fullscreen --nogui "{rom_file}"'
-    elif 'epsxe' in emulator_name:
-        return f'"{emulator_path}" -nogui -loadbin "{rom_file}"'
-    elif 'project64' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'dolphin' in emulator_name:
-        return f'"{emulator_path}" -e "{rom_file}"'
-    elif 'flycast' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'fusion' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'snes9x' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'nestopia' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'visualboyadvance' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'desmume' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'ppsspp' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'mame' in emulator_name:
+    # First emulator family whose name appears in the executable name, checked in table order
+    family, args = next(((family, args) for family, args in EMULATOR_ARGS if family in emulator_name), (None, ''))
+    prefix = f'{args} ' if args else ''
+    
+    if family == 'mame':
         # For MAME, we need to extract the ROM name from the file
-        rom_name = rom_file.stem
-        return f'"{emulator_path}" "{rom_name}"'
-    elif 'x64' in emulator_name:  # VICE C64 emulator
-        return f'"{emulator_path}" "{rom_file}"'
-    elif 'winuae' in emulator_name:
-        return f'"{emulator_path}" -f "{rom_file}"'
-    elif 'stella' in emulator_name:
-        return f'"{emulator_path}" "{rom_file}"'
-    else:
-        # Default: just pass the ROM file as argument
-        return f'"{emulator_path}" "{rom_file}"'
-
-
-def create_rom_shortcut(emulator_path, rom_file, shortcut_path):
+        return lambda rom_file: f'{prefix}"{rom_file.stem}"'
+    
+    # Default: just pass the ROM file as argument
+    return lambda rom_file: f'{prefix}"{rom_file}"'
+
+
+# WScript.Shell lives in a single-threaded COM apartment, so each worker thread gets its own
+_thread_state = threading.local()
+
+
+def get_shell():
+    """Return this thread's WScript.Shell COM object, creating it on first use."""
+    shell = getattr(_thread_state, 'shell', None)
+    if shell is None:
+        shell = _thread_state.shell = win32com.client.Dispatch("WScript.Shell")
+    return shell
+
+
+def create_rom_shortcut(emulator_path, arguments, rom_file, shortcut_path):
     """Create a Windows shortcut that launches a ROM through its emulator."""
     try:
-        # Create a batch file that launches the emulator with the ROM
-        batch_content = f'@echo off\n{get_emulator_args(emulator_path, rom_file)}\n'
-        
-        # Create the batch file
-        batch_file = shortcut_path.with_suffix('.bat')
-        with open(batch_file, 'w', encoding='utf-8') as f:
-            f.write(batch_content)
-        
-        # Create shortcut to the batch file
-        shell = win32com.client.Dispatch("WScript.Shell")
-        shortcut = shell.CreateShortCut(str(shortcut_path))
-        shortcut.Targetpath = str(batch_file)
+        # Point the shortcut straight at the emulator and pass the ROM as its arguments
+        shortcut = get_shell().CreateShortCut(shortcut_path)
+        shortcut.Targetpath = str(emulator_path)
+        shortcut.Arguments = arguments
+        shortcut.IconLocation = f"{emulator_path},0"
         shortcut.WorkingDirectory = str(rom_file.parent)
         shortcut.Description = f"Launch {rom_file.name} via {Path(emulator_path).name}"
         shortcut.save()
@@ -157,9 +276,7 @@ def get_rom_shortcut_name(rom_file, rom_dir):
     rom_name = rom_file.stem
     
     # Remove common prefixes/suffixes
-    rom_name = rom_name.replace('(USA)', '').replace('(EUR)', '').replace('(JPN)', '')
-    rom_name = rom_name.replace('[USA]', '').replace('[EUR]', '').replace('[JPN]', '')
-    rom_name = rom_name.strip()
+    rom_name = REGION_TAG_RE.sub('', rom_name).strip()
     
     return f"{rom_name} ({system_name})"
 
@@ -172,6 +289,8 @@ def main():
                        help='Clean old shortcuts that no longer point to existing ROMs')
     parser.add_argument('--dry-run', '-d', action='store_true',
                        help='Show what would be created without actually creating shortcuts')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='List every shortcut skipped because it already exists')
     
     args = parser.parse_args()
     
@@ -201,16 +320,63 @@ def main():
         output_path.mkdir(parents=True, exist_ok=True)
         print(f"Created output directory: {output_path}")
     
-    # Find all ROM files from all directories
-    all_roms = []
+    if not args.dry_run:
+        # List the output directory once instead of checking each shortcut path;
+        # names are compared lowercased as Windows paths are case-insensitive
+        with os.scandir(output_path) as entries:
+            existing_names = {entry.name.lower() for entry in entries}
+        
+        # Resolve each emulator's argument format once rather than per ROM
+        templates = {emulator_path: build_args_template(emulator_path) for emulator_path in set(rom_mappings.values())}
+        
+        # Shortcut paths are built by string concatenation rather than Path joins
+        output_prefix = os.path.join(str(output_path), '')
+    
+    # Scan every directory in a single pass, keeping only the shortcuts still to create
+    total_roms = 0
     empty_directories = []
+    pending = []
+    skipped_shortcuts = 0
+    seen_files = set()
     
-    for rom_dir, emulator_path in rom_mappings.items():
+    for rom_dir, rom_files in scan_rom_directories(rom_mappings):
         print(f"Scanning: {rom_dir}")
-        rom_files = find_rom_files(rom_dir)
-        if rom_files:
-            all_roms.extend([(rom_file, emulator_path) for rom_file in rom_files])
-            print(f"  Found {len(rom_files)} ROM files")
+        emulator_path = rom_mappings[rom_dir]
+        emulator_name = Path(emulator_path).name
+        rom_count = 0
+        dry_run_lines = []
+        
+        for rom_file in rom_files:
+            # Skip ROMs already reached through another directory, symlink or junction
+            key = file_key(rom_file)
+            if key in seen_files:
+                continue
+            seen_files.add(key)
+            
+            rom_count += 1
+            shortcut_name = get_rom_shortcut_name(rom_file, rom_file.parent) + ".lnk"
+            
+            if args.dry_run:
+                dry_run_lines.append(f"  {shortcut_name} -> {rom_file} (via {emulator_name})\n")
+                continue
+            
+            # Skip if shortcut already exists
+            if shortcut_name.lower() in existing_names:
+                if args.verbose:
+                    print(f"Shortcut already exists: {shortcut_name}")
+                skipped_shortcuts += 1
+                continue
+            
+            arguments = templates[emulator_path](rom_file)
+            pending.append((shortcut_name, (emulator_path, arguments, rom_file, output_prefix + shortcut_name)))
+            existing_names.add(shortcut_name.lower())
+        
+        # Dry-run listing is written once per directory
+        sys.stdout.write("".join(dry_run_lines))
+        total_roms += rom_count
+        
+        if rom_count:
+            print(f"  Found {rom_count} ROM files")
         else:
             empty_directories.append(rom_dir)
             print(f"  No ROM files found")
@@ -222,46 +388,35 @@ def main():
             print(f"  {directory}")
         print()
     
-    if not all_roms:
+    if not total_roms:
         print("No ROM files found in any directory.")
         return 0
     
-    print(f"Total ROM files found: {len(all_roms)}")
+    print(f"Total ROM files found: {total_roms}")
     
     if args.dry_run:
-        print("\nShortcuts that would be created:")
-        for rom_file, emulator_path in all_roms:
-            shortcut_name = get_rom_shortcut_name(rom_file, rom_file.parent) + ".lnk"
-            print(f"  {shortcut_name} -> {rom_file} (via {Path(emulator_path).name})")
         return 0
     
     print("\nCreating shortcuts...")
     
     # Create shortcuts
     successful_shortcuts = 0
-    skipped_shortcuts = 0
     failed_shortcuts = 0
     
-    for rom_file, emulator_path in all_roms:
-        # Create shortcut name
-        shortcut_name = get_rom_shortcut_name(rom_file, rom_file.parent) + ".lnk"
-        shortcut_path = output_path / shortcut_name
-        
-        # Skip if shortcut already exists
-        if shortcut_path.exists():
-            print(f"Shortcut already exists: {shortcut_name}")
-            skipped_shortcuts += 1
-            continue
+    # Create them in parallel; each worker initializes COM for its own thread
+    with ThreadPoolExecutor(max_workers=SHORTCUT_WORKERS, initializer=pythoncom.CoInitialize) as executor:
+        results = executor.map(lambda task: create_rom_shortcut(*task[1]), pending)
         
-        if create_rom_shortcut(emulator_path, rom_file, shortcut_path):
-            print(f"Created: {shortcut_name}")
-            successful_shortcuts += 1
-        else:
-            print(f"Failed: {shortcut_name}")
-            failed_shortcuts += 1
+        for (shortcut_name, _), created in zip(pending, results):
+            if created:
+                print(f"Created: {shortcut_name}")
+                successful_shortcuts += 1
+            else:
+                print(f"Failed: {shortcut_name}")
+                failed_shortcuts += 1
     
     print(f"\nSummary:")
-    print(f"Total ROM files found: {len(all_roms)}")
+    print(f"Total ROM files found: {total_roms}")
     print(f"Shortcuts created successfully: {successful_shortcuts}")
     print(f"Shortcuts skipped (already exist): {skipped_shortcuts}")
     print(f"Shortcuts failed: {failed_shortcuts}")
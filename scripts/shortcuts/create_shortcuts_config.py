@@ -7,10 +7,163 @@ Reads game directories from a config file and creates shortcuts.
 import os
 import sys
 import argparse
+import functools
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import pythoncom
 import win32com.client
 
 
+# Shortcuts created concurrently
+SHORTCUT_WORKERS = 8
+
+# Game directories scanned concurrently
+SCAN_WORKERS = 4
+
+# Prefix of the output directory setting in the configuration file
+OUTPUT_PREFIX = 'OUTPUT_DIR = '
+
+# Common executable extensions, as a tuple for str.endswith
+EXE_EXTENSIONS = ('.exe', '.bat', '.cmd', '.msi', '.com')
+
+
+# Exclude patterns for common non-game executables
+EXCLUDE_PATTERNS = [
+    'unins000.exe', 'unins001.exe', 'unins002.exe',  # Uninstallers
+    'UnityCrashHandler',  # Unity crash handlers
+    'dxwebsetup.exe', 'DXSETUP.exe',  # DirectX installer
+    'QuickSFV.EXE',  # File verification tool
+    'CrashReportClient.exe', 'crashpad_handler.exe',  # Crash reporting
+    'EpicWebHelper.exe',  # Epic launcher helper
+    'createdump.exe',  # Debug dump tool
+    'msiexec.exe',  # Windows installer
+    'RemoveProtos.exe',  # Game cleanup tool
+    'Language Selector.exe',  # Language selection tool
+    'CrashSender',  # Crash reporting tools
+    'UWP_Helper',  # Windows Store helper
+    'HV_ASUSclient.exe',  # Hardware-specific client
+    'vcredist', 'vc_redist',  # Visual C++ redistributables
+    'dotnetfx', 'NDP',  # .NET Framework installers
+    'PhysX',  # PhysX installers
+    'oalinst.exe',  # OpenAL installer
+    'UE4PrereqSetup', 'UEPrereqSetup',  # Unreal Engine prerequisites
+    'ActivationUI.exe',  # Activation UI
+    'clientdx.exe', 'clientogl.exe', 'clientxna.exe',  # Client executables
+    'clokspl.exe',  # Clock splash
+    'CSGMERGE.exe',  # CSG merge tool
+    'devcon32.exe', 'devcon64.exe',  # Device console
+    'DOSBox.exe', 'GOGDOSConfig.exe',  # DOS emulation
+    'DromEd.exe',  # DromEd editor
+    'ergccopier.exe',  # ERG copier
+    'FinalAlert2MO.exe',  # Final Alert 2
+    'gamemd.exe',  # Game MD
+    'Generals.exe',  # Generals (duplicate)
+    'GOLDSKIP.exe',  # Gold skip
+    'Guild3ModLauncher.exe', 'Guild3ModUploader.exe',  # Mod tools
+    'install_swrnet.bat',  # Install script
+    'json_formatter.exe',  # JSON formatter
+    'MentalOmegaClient.exe',  # Mental Omega client
+    'Microsoft .NET Framework',  # .NET Framework
+    'Microsoft Visual C++',  # Visual C++
+    'mph.exe', 'mphmd.exe',  # MPH tools
+    'NOX.exe',  # NOX (duplicate)
+    'PBAConfig.exe',  # Pinball Arcade config
+    'pbsvc.exe',  # PunkBuster service
+    'PinballArcade11.exe',  # Pinball Arcade 11
+    'PinballM-UNLOCKER.exe',  # Pinball M unlocker
+    'Ra2.exe', 'RA2Launcher.exe', 'RA2MD.exe',  # Red Alert 2
+    'Register.exe',  # Register
+    'rgb2theora.exe',  # RGB to Theora
+    'ROTR185_Lnchr.exe', 'ROTRMapPack_V2.exe',  # ROTR tools
+    'RPG_RT.exe',  # RPG Runtime
+    'Setup.exe',  # Setup
+    'setup_the_guild_3',  # Guild 3 setup
+    'Slot Shots Pinball Ultimate.exe',  # Slot Shots Pinball
+    'SpaceChem.exe',  # SpaceChem
+    'SuchArtLinkLauncher.exe',  # SuchArt launcher
+    'SUN.exe',  # SUN
+    'SWR.net',  # SWR.net tools
+    'Syringe.exe',  # Syringe
+    'The Bard\'s Tale.exe',  # Bard's Tale
+    'Thief2.exe',  # Thief 2
+    'tis100.exe',  # TIS-100
+    'Touchup.exe',  # Touchup
+    'TSGDITP1.exe', 'TSNODTP1.exe',  # TS themes
+    'TSLauncher.exe',  # TS launcher
+    'Uinst_ROTR_Beta185.exe',  # Uninstall ROTR
+    'Uninst.exe', 'uninstll.exe',  # Uninstallers
+    'UninstRotrMaps.exe',  # Uninstall ROTR maps
+    'UninstSwrnet.bat',  # Uninstall SWR.net
+    'Verify BIN files before installation.bat',  # Verify script
+    'WestwoodOnline.msi',  # Westwood Online
+    'WorldBuilder.exe', 'WorldBuilder_ROTR.exe',  # World builders
+    'YURI.exe',  # YURI
+    'Zombasite.exe',  # Zombasite
+    # Additional exclusions
+    'Server.exe', 'server.exe',  # Server executables
+    'Launcher.exe', 'launcher.exe',  # Generic launchers (we'll prefer main game exes)
+    'Cleanup.exe', 'cleanup.exe',  # Cleanup tools
+    'BF4WebHelper.exe', 'BF4X86WebHelper.exe',  # Battlefield helpers
+    'BFLauncher.exe', 'BFLauncher_x86.exe',  # Battlefield launchers
+    'battlelog-web-plugins.exe',  # Battlelog plugins
+    'badvpn-client.exe', 'badvpntcp.bat',  # VPN clients
+    'swrnet-client.exe',  # SWR.net client
+    'EOSAuthLauncher.exe',  # Epic Online Services
+    'install_pspc_sdk_runtime.bat',  # PSPC runtime
+    'easyanticheat_eos_setup.exe',  # EasyAntiCheat
+    'install_easyanticheat_eos_setup.bat',  # EasyAntiCheat install
+    'uninstall_easyanticheat_eos_setup.bat',  # EasyAntiCheat uninstall
+    'InjectorCLIx64.exe',  # Injector
+    'crs-handler.exe',  # CRS handler
+    # 'launchmod_',  # Mod launchers - now included
+    # 'modengine2_launcher.exe',  # ModEngine launcher - now included
+    # 'start_protected_game.exe',  # Protected game launcher - now included
+    'dowser.exe',  # Dowser
+    'CrashReporter.exe',  # Crash reporter
+    'launcher-installer-windows',  # Launcher installer
+    'Uninstall Vortex.exe',  # Vortex uninstaller
+    'elevate.exe',  # Elevate
+    'dotnetprobe.exe',  # .NET probe
+    'divine.exe',  # Divine
+    'ARCtool.exe',  # ARC tool
+    'quickbms_4gb_files.exe',  # QuickBMS
+    '7z.exe',  # 7-Zip
+    'ModInstallerIPC.exe',  # Mod installer
+    'apphost.exe',  # App host
+    'compress_bitmaps.bat',  # Bitmap compression
+    'UnrealCEFSubProcess.exe',  # Unreal CEF subprocess
+    'easyanticheat_setup.exe',  # EasyAntiCheat setup
+    'Rockstar-Games-Launcher.exe',  # Rockstar launcher
+    'Social-Club-Setup.exe',  # Social Club setup
+    'VulkanRT-',  # Vulkan runtime
+    'python.exe', 'pythonw.exe',  # Python
+    'zsync.exe', 'zsyncmake.exe',  # Zsync
+    'TTS-Deck-Editor.exe',  # TTS deck editor
+    'run_',  # Run scripts
+    'ZFGameBrowser.exe',  # ZF game browser
+    'openmw-',  # OpenMW tools
+    'Uninstall.exe',  # Generic uninstaller
+]
+
+# All exclude patterns as one alternation, matched against lowercased file names
+EXCLUDE_RE = re.compile('|'.join(re.escape(pattern.lower()) for pattern in EXCLUDE_PATTERNS))
+
+# Patterns that are whole executable names, checked by set lookup before falling back to EXCLUDE_RE
+EXCLUDE_NAMES = frozenset(
+    pattern.lower() for pattern in EXCLUDE_PATTERNS
+    if pattern.lower().endswith(EXE_EXTENSIONS)
+)
+
+# Keywords that mark a .lnk file as a game launcher
+LAUNCHER_RE = re.compile(r'launch|play|start|run')
+
+# Redistributable/prerequisite folders inside a game (e.g. _CommonRedist, DirectX, PhysX) hold only installers
+REDIST_DIR_RE = re.compile(r'redist|directx|dotnetfx|physx|prereq')
+
+
 def read_config(config_file):
     """Read game directories from configuration file."""
     directories = []
@@ -25,16 +178,16 @@ def read_config(config_file):
             line = line.strip()
             
             # Skip empty lines and comments
-            if not line or line.startswith('#'):
+            if not line or line[0] == '#':
                 continue
             
             # Handle output directory setting
-            if line.startswith('OUTPUT_DIR = '):
-                output_dir = line.split('=', 1)[1].strip()
+            if line.startswith(OUTPUT_PREFIX):
+                output_dir = line[len(OUTPUT_PREFIX):].strip()
                 continue
             
-            # Add directory to list
-            if os.path.exists(line):
+            # Add directory to list; only directories can be scanned
+            if os.path.isdir(line):
                 directories.append(line)
             else:
                 print(f"Warning: Directory '{line}' (line {line_num}) does not exist. Skipping.")
@@ -42,6 +195,60 @@ def read_config(config_file):
     return directories, output_dir
 
 
+def iter_files(top):
+    """Yield (DirEntry, game_dir) for every file under top, walking directories in os.walk order.
+    
+    game_dir is the name of the first-level directory the file sits in, or None for files directly in top.
+    Folders matching REDIST_DIR_RE inside a game directory are not descended into.
+    """
+    stack = [(top, None)]
+    
+    while stack:
+        subdirs = []
+        path, game_dir = stack.pop()
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # DirEntry caches the file type from the directory listing, so no extra stat here
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    
+                    if not is_dir:
+                        yield entry, game_dir
+                    elif entry.is_symlink():
+                        continue
+                    elif game_dir is None:
+                        # The game directory is passed down instead of recomputed from each file path
+                        subdirs.append((entry.path, entry.name))
+                    elif not REDIST_DIR_RE.search(entry.name.lower()):
+                        # Installer folders are pruned below game level; game folders themselves are never skipped
+                        subdirs.append((entry.path, game_dir))
+        except OSError:
+            # Unreadable directory, skipped like os.walk does
+            pass
+        
+        stack.extend(reversed(subdirs))
+
+
+def selection_key(exe_path):
+    """Rank an executable by preference, then by name; the lowest key is the one to launch."""
+    name = os.path.basename(exe_path).lower()
+    # Prefer .lnk launcher files (for DOSBox games)
+    if name.endswith('.lnk'):
+        return -1, name
+    # Prefer main game executables over shipping builds
+    elif 'shipping' in name:
+        return 3, name
+    elif 'win64' in name:
+        return 2, name
+    elif 'launcher' in name:
+        return 1, name
+    else:
+        return 0, name
+
+
 def find_executables(target_dir):
     """Find all executable files in subdirectories of the target directory."""
     target_path = Path(target_dir)
@@ -52,174 +259,29 @@ def find_executables(target_dir):
     if not target_path.is_dir():
         return []
     
-    # Common executable extensions
-    exe_extensions = {'.exe', '.bat', '.cmd', '.msi', '.com'}
-    
-    # Exclude patterns for common non-game executables
-    exclude_patterns = [
-        'unins000.exe', 'unins001.exe', 'unins002.exe',  # Uninstallers
-        'UnityCrashHandler',  # Unity crash handlers
-        'dxwebsetup.exe', 'DXSETUP.exe',  # DirectX installer
-        'QuickSFV.EXE',  # File verification tool
-        'CrashReportClient.exe', 'crashpad_handler.exe',  # Crash reporting
-        'EpicWebHelper.exe',  # Epic launcher helper
-        'createdump.exe',  # Debug dump tool
-        'msiexec.exe',  # Windows installer
-        'RemoveProtos.exe',  # Game cleanup tool
-        'Language Selector.exe',  # Language selection tool
-        'CrashSender',  # Crash reporting tools
-        'UWP_Helper',  # Windows Store helper
-        'HV_ASUSclient.exe',  # Hardware-specific client
-        'vcredist', 'vc_redist',  # Visual C++ redistributables
-        'dotnetfx', 'NDP',  # .NET Framework installers
-        'PhysX',  # PhysX installers
-        'oalinst.exe',  # OpenAL installer
-        'UE4PrereqSetup', 'UEPrereqSetup',  # Unreal Engine prerequisites
-        'ActivationUI.exe',  # Activation UI
-        'clientdx.exe', 'clientogl.exe', 'clientxna.exe',  # Client executables
-        'clokspl.exe',  # Clock splash
-        'CSGMERGE.exe',  # CSG merge tool
-        'devcon32.exe', 'devcon64.exe',  # Device console
-        'DOSBox.exe', 'GOGDOSConfig.exe',  # DOS emulation
-        'DromEd.exe',  # DromEd editor
-        'ergccopier.exe',  # ERG copier
-        'FinalAlert2MO.exe',  # Final Alert 2
-        'gamemd.exe',  # Game MD
-        'Generals.exe',  # Generals (duplicate)
-        'GOLDSKIP.exe',  # Gold skip
-        'Guild3ModLauncher.exe', 'Guild3ModUploader.exe',  # Mod tools
-        'install_swrnet.bat',  # Install script
-        'json_formatter.exe',  # JSON formatter
-        'MentalOmegaClient.exe',  # Mental Omega client
-        'Microsoft .NET Framework',  # .NET Framework
-        'Microsoft Visual C++',  # Visual C++
-        'mph.exe', 'mphmd.exe',  # MPH tools
-        'NOX.exe',  # NOX (duplicate)
-        'PBAConfig.exe',  # Pinball Arcade config
-        'pbsvc.exe',  # PunkBuster service
-        'PinballArcade11.exe',  # Pinball Arcade 11
-        'PinballM-UNLOCKER.exe',  # Pinball M unlocker
-        'Ra2.exe', 'RA2Launcher.exe', 'RA2MD.exe',  # Red Alert 2
-        'Register.exe',  # Register
-        'rgb2theora.exe',  # RGB to Theora
-        'ROTR185_Lnchr.exe', 'ROTRMapPack_V2.exe',  # ROTR tools
-        'RPG_RT.exe',  # RPG Runtime
-        'Setup.exe',  # Setup
-        'setup_the_guild_3',  # Guild 3 setup
-        'Slot Shots Pinball Ultimate.exe',  # Slot Shots Pinball
-        'SpaceChem.exe',  # SpaceChem
-        'SuchArtLinkLauncher.exe',  # SuchArt launcher
-        'SUN.exe',  # SUN
-        'SWR.net',  # SWR.net tools
-        'Syringe.exe',  # Syringe
-        'The Bard\'s Tale.exe',  # Bard's Tale
-        'Thief2.exe',  # Thief 2
-        'tis100.exe',  # TIS-100
-        'Touchup.exe',  # Touchup
-        'TSGDITP1.exe', 'TSNODTP1.exe',  # TS themes
-        'TSLauncher.exe',  # TS launcher
-        'Uinst_ROTR_Beta185.exe',  # Uninstall ROTR
-        'Uninst.exe', 'uninstll.exe',  # Uninstallers
-        'UninstRotrMaps.exe',  # Uninstall ROTR maps
-        'UninstSwrnet.bat',  # Uninstall SWR.net
-        'Verify BIN files before installation.bat',  # Verify script
-        'WestwoodOnline.msi',  # Westwood Online
-        'WorldBuilder.exe', 'WorldBuilder_ROTR.exe',  # World builders
-        'YURI.exe',  # YURI
-        'Zombasite.exe',  # Zombasite
-        # Additional exclusions
-        'Server.exe', 'server.exe',  # Server executables
-        'Launcher.exe', 'launcher.exe',  # Generic launchers (we'll prefer main game exes)
-        'Cleanup.exe', 'cleanup.exe',  # Cleanup tools
-        'BF4WebHelper.exe', 'BF4X86WebHelper.exe',  # Battlefield helpers
-        'BFLauncher.exe', 'BFLauncher_x86.exe',  # Battlefield launchers
-        'battlelog-web-plugins.exe',  # Battlelog plugins
-        'badvpn-client.exe', 'badvpntcp.bat',  # VPN clients
-        'swrnet-client.exe',  # SWR.net client
-        'EOSAuthLauncher.exe',  # Epic Online Services
-        'install_pspc_sdk_runtime.bat',  # PSPC runtime
-        'easyanticheat_eos_setup.exe',  # EasyAntiCheat
-        'install_easyanticheat_eos_setup.bat',  # EasyAntiCheat install
-        'uninstall_easyanticheat_eos_setup.bat',  # EasyAntiCheat uninstall
-        'InjectorCLIx64.exe',  # Injector
-        'crs-handler.exe',  # CRS handler
-        # 'launchmod_',  # Mod launchers - now included
-        # 'modengine2_launcher.exe',  # ModEngine launcher - now included
-        # 'start_protected_game.exe',  # Protected game launcher - now included
-        'dowser.exe',  # Dowser
-        'CrashReporter.exe',  # Crash reporter
-        'launcher-installer-windows',  # Launcher installer
-        'Uninstall Vortex.exe',  # Vortex uninstaller
-        'elevate.exe',  # Elevate
-        'dotnetprobe.exe',  # .NET probe
-        'divine.exe',  # Divine
-        'ARCtool.exe',  # ARC tool
-        'quickbms_4gb_files.exe',  # QuickBMS
-        '7z.exe',  # 7-Zip
-        'ModInstallerIPC.exe',  # Mod installer
-        'apphost.exe',  # App host
-        'compress_bitmaps.bat',  # Bitmap compression
-        'UnrealCEFSubProcess.exe',  # Unreal CEF subprocess
-        'easyanticheat_setup.exe',  # EasyAntiCheat setup
-        'Rockstar-Games-Launcher.exe',  # Rockstar launcher
-        'Social-Club-Setup.exe',  # Social Club setup
-        'VulkanRT-',  # Vulkan runtime
-        'python.exe', 'pythonw.exe',  # Python
-        'zsync.exe', 'zsyncmake.exe',  # Zsync
-        'TTS-Deck-Editor.exe',  # TTS deck editor
-        'run_',  # Run scripts
-        'ZFGameBrowser.exe',  # ZF game browser
-        'openmw-',  # OpenMW tools
-        'Uninstall.exe',  # Generic uninstaller
-    ]
-    
     # Group executables by game directory
-    game_dirs = {}
+    game_dirs = defaultdict(list)
     
-    for root, dirs, files in os.walk(target_path):
-        for file in files:
-            file_path = Path(root) / file
-            
-            # Check if it's an executable
-            if file_path.suffix.lower() not in exe_extensions:
-                continue
-            
-            # Check exclude patterns
-            should_exclude = False
-            file_name = file_path.name.lower()
-            
-            for pattern in exclude_patterns:
-                pattern_lower = pattern.lower()
-                if pattern_lower in file_name:
-                    should_exclude = True
-                    break
-            
-            if should_exclude:
+    # One pass collects both executables and launcher shortcuts (for DOSBox games and other launchers)
+    for entry, game_dir in iter_files(target_path):
+        file_name = entry.name.lower()
+        
+        if file_name.endswith('.lnk'):
+            # Only include .lnk files that look like game launchers
+            if not LAUNCHER_RE.search(file_name):
                 continue
-            
-            # Find the game directory (first level under target)
-            relative_path = file_path.relative_to(target_path)
-            game_dir = relative_path.parts[0] if relative_path.parts else "root"
-            
-            if game_dir not in game_dirs:
-                game_dirs[game_dir] = []
-            
-            game_dirs[game_dir].append(file_path)
-    
-    # Also check for existing .lnk files (for DOSBox games and other launchers)
-    for root, dirs, files in os.walk(target_path):
-        for file in files:
-            if file.lower().endswith('.lnk'):
-                file_path = Path(root) / file
-                relative_path = file_path.relative_to(target_path)
-                game_dir = relative_path.parts[0] if relative_path.parts else "root"
-                
-                # Only include .lnk files that look like game launchers
-                file_name_lower = file.lower()
-                if any(keyword in file_name_lower for keyword in ['launch', 'play', 'start', 'run']):
-                    if game_dir not in game_dirs:
-                        game_dirs[game_dir] = []
-                    game_dirs[game_dir].append(file_path)
+        elif not file_name.endswith(EXE_EXTENSIONS):
+            # Not an executable
+            continue
+        elif file_name in EXCLUDE_NAMES or EXCLUDE_RE.search(file_name):
+            # Matches an exclude pattern
+            continue
+        
+        # Files directly under the target form their own group
+        game_dir = game_dir or entry.name
+        
+        # Paths stay plain strings; the shortcut API takes them as-is
+        game_dirs[game_dir].append(entry.path)
     
     # Select one executable per game directory
     selected_executables = []
@@ -227,37 +289,37 @@ def find_executables(target_dir):
     for game_dir, executables in game_dirs.items():
         if not executables:
             continue
-            
-        # Sort executables by preference
-        def sort_key(exe_path):
-            name = exe_path.name.lower()
-            # Prefer .lnk launcher files (for DOSBox games)
-            if name.endswith('.lnk'):
-                return -1
-            # Prefer main game executables over shipping builds
-            elif 'shipping' in name:
-                return 3
-            elif 'win64' in name:
-                return 2
-            elif 'launcher' in name:
-                return 1
-            else:
-                return 0
-        
-        # Sort by preference, then by name
-        executables.sort(key=lambda x: (sort_key(x), x.name.lower()))
         
-        # Select the best executable
-        selected = executables[0]
-        selected_executables.append(selected)
+        # Select the best executable; min() finds it without sorting the whole group
+        selected_executables.append(min(executables, key=selection_key))
     
     return selected_executables
 
 
+def scan_directories(directories):
+    """Yield (directory, executables) in the given order, scanning several directories concurrently."""
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+        yield from zip(directories, executor.map(find_executables, directories))
+
+
+def file_key(path):
+    """Return (device, inode) for path so links to the same file compare equal; falls back to the path."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path
+    return stat.st_dev, stat.st_ino
+
+
+@functools.lru_cache(maxsize=None)
 def get_shortcut_name(exe_path):
-    """Generate a better name for the shortcut based on the executable and directory."""
-    name = exe_path.name.lower()
-    game_dir = exe_path.parent.name
+    """Generate a better name for the shortcut based on the executable and directory.
+    
+    Cached, as the same path is named again when cleaning and when creating shortcuts.
+    """
+    file_name = os.path.basename(exe_path)
+    name = file_name.lower()
+    game_dir = os.path.basename(os.path.dirname(exe_path))
     
     # Map specific launchers to better names
     if 'modengine2_launcher.exe' in name:
@@ -275,24 +337,36 @@ def get_shortcut_name(exe_path):
         return f"{game_dir} (Mod - {mod_name.title()})"
     elif name.endswith('.lnk'):
         # For .lnk files, use the filename without extension
-        return exe_path.stem
+        return os.path.splitext(file_name)[0]
     else:
         # Default: use the executable name without extension
-        return exe_path.stem
+        return os.path.splitext(file_name)[0]
+
+
+# WScript.Shell lives in a single-threaded COM apartment, so each worker thread gets its own
+_thread_state = threading.local()
+
+
+def get_shell():
+    """Return this thread's WScript.Shell COM object, creating it on first use."""
+    shell = getattr(_thread_state, 'shell', None)
+    if shell is None:
+        shell = _thread_state.shell = win32com.client.Dispatch("WScript.Shell")
+    return shell
 
 
 def create_shortcut(target_path, shortcut_path, description=""):
     """Create a Windows shortcut (.lnk file) pointing to the target executable."""
+    working_dir, file_name = os.path.split(target_path)
     try:
-        shell = win32com.client.Dispatch("WScript.Shell")
-        shortcut = shell.CreateShortCut(str(shortcut_path))
-        shortcut.Targetpath = str(target_path)
-        shortcut.WorkingDirectory = str(target_path.parent)
-        shortcut.Description = description or f"Shortcut to {target_path.name}"
+        shortcut = get_shell().CreateShortCut(shortcut_path)
+        shortcut.Targetpath = target_path
+        shortcut.WorkingDirectory = working_dir
+        shortcut.Description = description or f"Shortcut to {file_name}"
         shortcut.save()
         return True
     except Exception as e:
-        print(f"Error creating shortcut for {target_path.name}: {e}")
+        print(f"Error creating shortcut for {file_name}: {e}")
         return False
 
 
@@ -302,14 +376,19 @@ def clean_old_shortcuts(output_dir, current_executables):
     if not output_path.exists():
         return 0
     
-    current_names = {exe.stem for exe in current_executables}
+    # Compare against the names the shortcuts are actually created with, not the bare executable stems
+    current_names = {get_shortcut_name(exe) for exe in current_executables}
     removed_count = 0
     
-    for shortcut_file in output_path.glob("*.lnk"):
-        shortcut_name = shortcut_file.stem
+    # One directory listing; the .lnk suffix is checked on the name without building Paths
+    with os.scandir(output_path) as entries:
+        shortcut_entries = [entry for entry in entries if entry.name.lower().endswith('.lnk') and entry.is_file()]
+    
+    for entry in shortcut_entries:
+        shortcut_name = entry.name[:-4]
         if shortcut_name not in current_names:
             try:
-                shortcut_file.unlink()
+                os.remove(entry.path)
                 print(f"Removed old shortcut: {shortcut_name}.lnk")
                 removed_count += 1
             except Exception as e:
@@ -326,6 +405,8 @@ def main():
                        help='Clean old shortcuts that no longer point to existing games')
     parser.add_argument('--dry-run', '-d', action='store_true',
                        help='Show what would be created without actually creating shortcuts')
+    parser.add_argument('--verbose', '-v', action='store_true',
+                       help='List every shortcut skipped because it already exists')
     
     args = parser.parse_args()
     
@@ -358,10 +439,19 @@ def main():
     # Find all executables from all directories
     all_executables = []
     empty_directories = []
+    seen_files = set()
     
-    for directory in directories:
+    for directory, found in scan_directories(directories):
         print(f"Scanning: {directory}")
-        executables = find_executables(directory)
+        executables = []
+        
+        # Skip executables already reached through another directory, symlink or junction
+        for exe_path in found:
+            key = file_key(exe_path)
+            if key not in seen_files:
+                seen_files.add(key)
+                executables.append(exe_path)
+        
         if executables:
             all_executables.extend(executables)
             print(f"  Found {len(executables)} executables")
@@ -384,9 +474,8 @@ def main():
     
     if args.dry_run:
         print("\nShortcuts that would be created:")
-        for exe_path in all_executables:
-            shortcut_name = get_shortcut_name(exe_path) + ".lnk"
-            print(f"  {shortcut_name} -> {exe_path}")
+        # Build the whole listing and write it once rather than printing line by line
+        sys.stdout.write("".join(f"  {get_shortcut_name(exe_path)}.lnk -> {exe_path}\n" for exe_path in all_executables))
         return 0
     
     # Clean old shortcuts if requested
@@ -402,23 +491,41 @@ def main():
     skipped_shortcuts = 0
     failed_shortcuts = 0
     
+    # List the output directory once instead of checking each shortcut path;
+    # names are compared lowercased as Windows paths are case-insensitive
+    with os.scandir(output_path) as entries:
+        existing_names = {entry.name.lower() for entry in entries}
+    
+    # Shortcut paths are built by string concatenation rather than Path joins
+    output_prefix = os.path.join(str(output_path), '')
+    
+    # Collect the shortcuts to create
+    pending = []
+    
     for exe_path in all_executables:
         # Create shortcut name using the improved naming function
         shortcut_name = get_shortcut_name(exe_path) + ".lnk"
-        shortcut_path = output_path / shortcut_name
-        
         # Skip if shortcut already exists
-        if shortcut_path.exists():
-            print(f"Shortcut already exists: {shortcut_name}")
+        if shortcut_name.lower() in existing_names:
+            if args.verbose:
+                print(f"Shortcut already exists: {shortcut_name}")
             skipped_shortcuts += 1
             continue
         
-        if create_shortcut(exe_path, shortcut_path):
-            print(f"Created: {shortcut_name}")
-            successful_shortcuts += 1
-        else:
-            print(f"Failed: {shortcut_name}")
-            failed_shortcuts += 1
+        pending.append((shortcut_name, (exe_path, output_prefix + shortcut_name)))
+        existing_names.add(shortcut_name.lower())
+    
+    # Create them in parallel; each worker initializes COM for its own thread
+    with ThreadPoolExecutor(max_workers=SHORTCUT_WORKERS, initializer=pythoncom.CoInitialize) as executor:
+        results = executor.map(lambda task: create_shortcut(*task[1]), pending)
+        
+        for (shortcut_name, _), created in zip(pending, results):
+            if created:
+                print(f"Created: {shortcut_name}")
+                successful_shortcuts += 1
+            else:
+                print(f"Failed: {shortcut_name}")
+                failed_shortcuts += 1
     
     print(f"\nSummary:")
     print(f"Total executables found: {len(all_executables)}")